@@ -0,0 +1,246 @@
+"""Пакетная обработка файлов сцены без окна.
+
+Каждый файл загружается, проходит цепочку шагов и сохраняется в
+выходной каталог под тем же именем. Несколько файлов обрабатываются
+параллельно в пуле процессов; единственный большой файл делится для
+булевых операций на группы объектов, которые объединяются в разных
+процессах.
+
+Запуск из корня проекта:
+    python batch.py scenes/*.gsk -o out --step "rotate 30" --step union --step "simplify 0.5"
+
+Шаги:
+    translate DX DY           перенос всех объектов
+    rotate ANGLE [CX CY]      поворот (по умолчанию вокруг центра сцены)
+    scale SX [SY [CX CY]]     масштабирование (по умолчанию от центра сцены)
+    union                     объединение всех замкнутых фигур в одну
+    symdiff                   симметрическая разность всех замкнутых фигур
+    simplify TOLERANCE        упрощение контуров многоугольников
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+import numpy as np
+
+from operations.simplify import simplify_ring
+from operations.tmo import TMOperations
+from operations.transformations import Transformation
+from primitives.bezier import BezierCurve
+from primitives.multi_polygon import MultiPolygon
+from primitives.polygon import Polygon
+from scene_file import SceneFile, save_scene
+from utils import lazy_import
+
+shapely = lazy_import("shapely")
+
+BOOLEAN_STEPS = {
+    "union": TMOperations.union_geometry,
+    "symdiff": TMOperations.symmetric_difference_geometry,
+}
+
+
+def scene_center(objects):
+    """Центр общего ограничивающего прямоугольника объектов"""
+    boxes = np.array([obj.bounding_box() for obj in objects])
+    return ((boxes[:, 0].min() + boxes[:, 2].max()) / 2,
+            (boxes[:, 1].min() + boxes[:, 3].max()) / 2)
+
+
+def transform_all(objects, matrix):
+    if objects:
+        Transformation.apply_to_objects(objects, matrix)
+    return objects
+
+
+def translate(objects, dx, dy):
+    return transform_all(objects, Transformation.translation_matrix(dx, dy))
+
+
+def rotate(objects, angle, *center):
+    if not objects:
+        return objects
+    return transform_all(objects, Transformation.rotation_matrix(angle, center or scene_center(objects)))
+
+
+def scale(objects, sx, sy=None, *center):
+    if not objects:
+        return objects
+    sy = sx if sy is None else sy
+    return transform_all(objects, Transformation.scale_matrix((sx, sy), center or scene_center(objects)))
+
+
+def simplify(objects, tolerance):
+    """Упрощает контуры многоугольников (Дуглас — Пекер, по каждому контуру)"""
+    result = []
+    for obj in objects:
+        if type(obj) is Polygon:
+            obj = Polygon(simplify_ring(obj.points, tolerance), obj.color)
+        elif isinstance(obj, MultiPolygon):
+            rings = [simplify_ring(ring, tolerance) for ring in obj.rings()]
+            ring_offsets = np.concatenate([[0], np.cumsum([len(ring) for ring in rings])])
+            obj = MultiPolygon(np.vstack(rings), obj.color, ring_offsets, obj.part_offsets)
+        result.append(obj)
+    return result
+
+
+def combine_group(kind, geometries):
+    """Булева операция над группой геометрий (выполняется в процессе пула)"""
+    return BOOLEAN_STEPS[kind](geometries)
+
+
+def boolean(objects, kind, pool=None, group_size=None):
+    """Заменяет все замкнутые фигуры результатом операции; кривые остаются.
+
+    С пулом и group_size геометрии делятся на группы, частичные результаты
+    считаются в разных процессах и сводятся той же операцией (обе операции
+    ассоциативны и коммутативны).
+    """
+    shapes = [obj for obj in objects if not isinstance(obj, BezierCurve)]
+    if len(shapes) < 2:
+        return objects
+    geometries = [obj.shapely_geometry() for obj in shapes]
+
+    if pool is not None and group_size and len(geometries) > group_size:
+        groups = [geometries[i:i + group_size] for i in range(0, len(geometries), group_size)]
+        geometries = list(pool.map(combine_group, [kind] * len(groups), groups))
+
+    result = TMOperations.result_shape(BOOLEAN_STEPS[kind](geometries), shapes[0].color)
+    curves = [obj for obj in objects if isinstance(obj, BezierCurve)]
+    return curves + [result] if result is not None else curves
+
+
+# Шаг: функция, допустимые числа аргументов и подсказка по записи
+STEPS = {
+    "translate": (translate, {2}, "translate DX DY"),
+    "rotate": (rotate, {1, 3}, "rotate ANGLE [CX CY]"),
+    "scale": (scale, {1, 2, 4}, "scale SX [SY [CX CY]]"),
+    "simplify": (simplify, {1}, "simplify TOLERANCE"),
+    "union": (boolean, {0}, "union"),
+    "symdiff": (boolean, {0}, "symdiff"),
+}
+
+
+def parse_step(text):
+    """Шаг цепочки из строки вида "rotate 30 100 100" """
+    name, *args = text.split()
+    if name not in STEPS:
+        raise argparse.ArgumentTypeError(f"неизвестный шаг: {name}")
+    _, counts, usage = STEPS[name]
+    if len(args) not in counts:
+        raise argparse.ArgumentTypeError(f"{name}: неверное число аргументов, ожидается «{usage}»")
+    try:
+        return name, [float(arg) for arg in args]
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"{name}: аргументы должны быть числами")
+
+
+def run_pipeline(objects, steps, pool=None, group_size=None):
+    for name, args in steps:
+        if name in BOOLEAN_STEPS:
+            objects = boolean(objects, name, pool, group_size)
+        else:
+            objects = STEPS[name][0](objects, *args)
+    return objects
+
+
+def process_file(path, steps, output_dir, pool=None, group_size=None):
+    """Загружает сцену, выполняет шаги и сохраняет результат; возвращает сводку"""
+    start = time.perf_counter()
+    scene = SceneFile(path)
+    objects = run_pipeline(list(scene), steps, pool, group_size)
+    output = os.path.join(output_dir, os.path.basename(path))
+    save_scene(output, objects)
+    return {
+        "input": path,
+        "output": output,
+        "objects_in": len(scene),
+        "objects_out": len(objects),
+        "vertices_out": int(sum(len(obj.points) for obj in objects)),
+        "seconds": time.perf_counter() - start,
+    }
+
+
+def file_errors():
+    """Ошибки, из-за которых пропускается один файл, а не вся обработка"""
+    return OSError, ValueError, shapely.errors.GEOSException
+
+
+def failed_file(path, error):
+    """Запись сводки о файле, который не удалось обработать"""
+    return {"input": path, "error": f"{type(error).__name__}: {error}"}
+
+
+def run(paths, steps, output_dir, workers=None, group_size=None):
+    """Обрабатывает файлы: по файлу на процесс, а один файл — группами объектов.
+
+    Ошибка в одном файле записывается в его сводку, остальные файлы
+    обрабатываются дальше.
+    """
+    names = {}
+    for path in paths:
+        if os.path.abspath(os.path.dirname(path)) == os.path.abspath(output_dir):
+            raise ValueError(f"{path}: выходной каталог совпадает с входным")
+        # Результаты пишутся в один каталог под именем исходного файла
+        other = names.setdefault(os.path.basename(path), path)
+        if os.path.abspath(other) != os.path.abspath(path):
+            raise ValueError(f"{other} и {path}: одинаковые имена файлов, результаты перезапишут друг друга")
+    os.makedirs(output_dir, exist_ok=True)
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        if len(paths) == 1:
+            try:
+                return [process_file(paths[0], steps, output_dir, pool, group_size)]
+            except file_errors() as e:
+                return [failed_file(paths[0], e)]
+
+        futures = [pool.submit(process_file, path, steps, output_dir) for path in paths]
+        summary = []
+        for path, future in zip(paths, futures):
+            try:
+                summary.append(future.result())
+            except file_errors() as e:
+                summary.append(failed_file(path, e))
+        return summary
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Пакетная обработка файлов сцены",
+                                     formatter_class=argparse.RawDescriptionHelpFormatter,
+                                     epilog="Шаги:" + __doc__.split("Шаги:")[1])
+    parser.add_argument("paths", nargs="+", help="файлы сцены (.gsk)")
+    parser.add_argument("-o", "--output-dir", required=True, help="каталог для результатов")
+    parser.add_argument("--step", dest="steps", type=parse_step, action="append", default=[],
+                        help='шаг цепочки, например "rotate 30"; шаги выполняются по порядку')
+    parser.add_argument("--workers", type=int, help="число процессов (по умолчанию по числу ядер)")
+    parser.add_argument("--group-size", type=int, default=256,
+                        help="объектов в группе при параллельной булевой операции над одним файлом")
+    parser.add_argument("--report", help="файл для JSON-сводки (по умолчанию stdout)")
+    args = parser.parse_args()
+
+    try:
+        summary = run(args.paths, args.steps, args.output_dir, args.workers, args.group_size)
+    except (OSError, ValueError) as e:
+        print(f"Ошибка: {e}", file=sys.stderr)
+        return 1
+
+    text = json.dumps(summary, indent=2, ensure_ascii=False)
+    if args.report:
+        with open(args.report, "w", encoding="utf-8") as f:
+            f.write(text)
+    else:
+        print(text)
+
+    failed = [entry for entry in summary if "error" in entry]
+    for entry in failed:
+        print(f"Ошибка: {entry['input']}: {entry['error']}", file=sys.stderr)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,194 @@
+"""Замеры горячих путей редактора без окна (SDL dummy).
+
+Запуск из корня проекта:
+    python -m benchmarks.bench --sizes 1000 10000 100000 --output bench.json
+"""
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+import numpy as np
+import pygame
+
+from editor import GraphicsEditor
+from operations.tmo import TMOperations
+from operations.transformations import Transformation
+from primitives.bezier import BezierCurve
+from primitives.polygon import Polygon
+from primitives.right_triangle import RightTriangle
+
+WIDTH, HEIGHT = 1348, 640
+
+
+def generate_scene(vertex_count, rng):
+    """Синтетическая сцена: примерно поровну вершин у многоугольников, треугольников и кривых"""
+    objects = []
+    share = vertex_count // 3
+    color = (0, 128, 255)
+
+    used = 0
+    while used < share:
+        n = int(rng.integers(3, 13))
+        cx, cy = rng.uniform(150, WIDTH - 50), rng.uniform(50, HEIGHT - 50)
+        radius = rng.uniform(5, 40)
+        angles = np.sort(rng.uniform(0, 2 * np.pi, n))
+        points = np.column_stack([cx + radius * np.cos(angles), cy + radius * np.sin(angles)])
+        objects.append(Polygon(points, color))
+        used += n
+
+    for _ in range(share // 3):
+        x, y = rng.uniform(150, WIDTH - 50), rng.uniform(50, HEIGHT - 50)
+        objects.append(RightTriangle([(x, y), (x + rng.uniform(5, 40), y + rng.uniform(5, 40))], color))
+
+    for _ in range(share // 4):
+        start = rng.uniform((150, 50), (WIDTH - 50, HEIGHT - 50))
+        points = start + rng.uniform(-40, 40, (4, 2))
+        objects.append(BezierCurve(points, color))
+
+    rng.shuffle(objects)
+    return objects
+
+
+def percentiles(samples):
+    samples = np.asarray(samples) * 1000.0
+    return {
+        "p50_ms": float(np.percentile(samples, 50)),
+        "p90_ms": float(np.percentile(samples, 90)),
+        "p99_ms": float(np.percentile(samples, 99)),
+        "max_ms": float(samples.max()),
+    }
+
+
+def bench_frames(editor, frames):
+    """Полная перерисовка и перерисовка после перемещения одного объекта"""
+    full = []
+    for _ in range(frames):
+        editor.full_redraw = True
+        start = time.perf_counter()
+        editor.render()
+        full.append(time.perf_counter() - start)
+
+    incremental = []
+    obj = editor.objects[len(editor.objects) // 2]
+    for i in range(frames):
+        obj.move((obj.position[0] + (1 if i % 2 else -1), obj.position[1]))
+        editor.update_objects([obj])
+        start = time.perf_counter()
+        editor.render()
+        incremental.append(time.perf_counter() - start)
+
+    return {"full": percentiles(full), "incremental": percentiles(incremental)}
+
+
+def bench_hit_test(editor, queries, rng):
+    """Выбор объекта щелчком в случайных точках холста"""
+    editor.current_tool = "select"
+    samples = []
+    for _ in range(queries):
+        pos = (int(rng.uniform(150, WIDTH)), int(rng.uniform(60, HEIGHT)))
+        event = pygame.event.Event(pygame.MOUSEBUTTONDOWN, pos=pos, button=1)
+        start = time.perf_counter()
+        editor.handle_mouse_down(event)
+        samples.append(time.perf_counter() - start)
+    editor.selected_objects = []
+    return percentiles(samples)
+
+
+def bench_transform(objects, repeats):
+    """Поворот и масштабирование всей сцены одной матрицей"""
+    vertices = sum(len(obj.points) for obj in objects)
+    rotate = Transformation.rotation_matrix(1.0, (WIDTH / 2, HEIGHT / 2))
+    scale = Transformation.scale_matrix((1.001, 1.001), (WIDTH / 2, HEIGHT / 2))
+
+    start = time.perf_counter()
+    for i in range(repeats):
+        Transformation.apply_to_objects(objects, rotate if i % 2 else scale)
+    elapsed = time.perf_counter() - start
+    return {
+        "seconds_per_call": elapsed / repeats,
+        "vertices_per_second": vertices * repeats / elapsed,
+    }
+
+
+def bench_booleans(objects, group_size):
+    """Объединение и симметрическая разность группы многоугольников"""
+    polygons = [obj for obj in objects if isinstance(obj, Polygon)][:group_size]
+    result = {"group_size": len(polygons)}
+    if len(polygons) < 2:
+        return result
+
+    start = time.perf_counter()
+    TMOperations.union_all(polygons)
+    result["union_s"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    TMOperations.symmetric_difference_all(polygons)
+    result["symmetric_difference_s"] = time.perf_counter() - start
+    return result
+
+
+def run(sizes, frames, queries, repeats, group_size, seed):
+    pygame.init()
+    report = {
+        "python": sys.version.split()[0],
+        "numpy": np.__version__,
+        "pygame": pygame.version.ver,
+        "platform": platform.platform(),
+        "results": [],
+    }
+
+    for size in sizes:
+        rng = np.random.default_rng(seed)
+        editor = GraphicsEditor(WIDTH, HEIGHT)
+        for obj in generate_scene(size, rng):
+            editor.add_object(obj)
+        editor.render()
+
+        entry = {
+            "vertices": sum(len(obj.points) for obj in editor.objects),
+            "objects": len(editor.objects),
+            "frame": bench_frames(editor, frames),
+            "hit_test": bench_hit_test(editor, queries, rng),
+            "transform": bench_transform(editor.objects, repeats),
+            "boolean": bench_booleans(editor.objects, group_size),
+        }
+        report["results"].append(entry)
+        print(f"{entry['vertices']:>9} вершин: кадр p50 {entry['frame']['full']['p50_ms']:.1f} мс, "
+              f"выбор p50 {entry['hit_test']['p50_ms']:.3f} мс, "
+              f"преобразование {entry['transform']['vertices_per_second'] / 1e6:.1f} млн верш./с",
+              file=sys.stderr)
+
+    pygame.quit()
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Замеры производительности редактора")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000],
+                        help="число вершин в синтетических сценах (до 1000000)")
+    parser.add_argument("--frames", type=int, default=20)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--repeats", type=int, default=10)
+    parser.add_argument("--group-size", type=int, default=200,
+                        help="число многоугольников в замере булевых операций")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="файл для JSON-отчёта (по умолчанию stdout)")
+    args = parser.parse_args()
+
+    report = run(args.sizes, args.frames, args.queries, args.repeats, args.group_size, args.seed)
+    text = json.dumps(report, indent=2, ensure_ascii=False)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(text)
+    else:
+        print(text)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,27 +1,76 @@
+import math
+from concurrent.futures import ThreadPoolExecutor
+
 import pygame
+from profiler import FrameProfiler
 from ui.toolbar import Toolbar
 from ui.palette import ColorPalette
-from operations.tmo import TMOperations
+from ui.perf_overlay import PerfOverlay
+from ui.camera import Camera
+from ui.fonts import load_font
+from ui.text_cache import TextCache
+from operations.background import TMOJob, TMO_PROGRESS, TMO_DONE
 from operations.transformations import Transformation
+from operations.spatial_index import SpatialGrid
+from operations.snapping import SnapIndex
+from operations.selection import area_box, select_in_lasso, select_in_rect
+from operations.history import History, TransformCommand, ColorCommand, SceneCommand
 from primitives.bezier import BezierCurve
 from primitives.polygon import Polygon
 from primitives.right_triangle import RightTriangle
+from primitives.shape import Shape
+from scene_file import SceneFile, save_scene
+
+def no_lap(phase):
+    """Заглушка замера фазы при выключенном профилировщике"""
+
 
 class GraphicsEditor:
-    def __init__(self, width, height):
+    snap_radius = 8  # радиус привязки к вершинам и сетке, пиксели
+    snap_tools = {"bezier", "triangle", "polygon", "rotate", "scale_x", "scale_xy"}
+    lasso_step = 3  # расстояние между точками лассо, экранные пиксели
+    tmo_names = {"union": "Объединение", "sym_diff": "Симметрическая разность"}
+
+    # Сдвиг вида стрелками, в экранных пикселях
+    pan_keys = {
+        pygame.K_LEFT: (50, 0),
+        pygame.K_RIGHT: (-50, 0),
+        pygame.K_UP: (0, 50),
+        pygame.K_DOWN: (0, -50),
+    }
+
+    def __init__(self, width, height, profile_path="frame_profile.json", scene_path="scene.gsk",
+                 max_fps=60, startup=None):
         self.width = width
         self.height = height
+        self.max_fps = max_fps  # предел частоты кадров при работе с холстом (0 — без предела)
         self.screen = pygame.display.set_mode((width, height))
         pygame.display.set_caption("Векторный графический редактор (Вариант 78)")
 
         self.background = (240, 240, 240)
         self.objects = []
+        self.vertex_count = 0  # вершин на сцене, для панели профилировщика
+        self.index = SpatialGrid()
+        self.snap_index = SnapIndex()  # вершины и середины рёбер для привязки
         self.selected_objects = []
         self.dragging = False
         self.current_tool = "select"
         self.current_color = (0, 0, 0)
         self.temp_points = []
 
+        # Камера бесконечного холста: колесо — масштаб, средняя кнопка и стрелки — сдвиг
+        self.camera = Camera()
+        self.panning = False
+
+        # Движения мыши за кадр сливаются: применяется только итог
+        self.drag_target = None
+        self.pan_delta = (0, 0)
+
+        # Выделение рамкой (протяжка с пустого места) или лассо (с Ctrl):
+        # мировые точки области, для рамки — два угла
+        self.selection_area = None
+        self.selection_mode = None
+
         self.toolbar = Toolbar(20, 20, [
             ("select", "Выделение"),
             ("bezier", "Кривая Безье"),
@@ -41,20 +90,189 @@ class GraphicsEditor:
             (0, 0, 255), (255, 255, 0), (128, 0, 128)
         ])
 
-        self.font = pygame.font.SysFont(None, 24)
+        self.font = load_font(24)
+        self.text_cache = TextCache(self.font)
         self.status = "Готов"
+        self.mouse_pos = None  # для подсветки кнопок под курсором
+
+        # Отрисовка только изменившихся областей
+        self.grid_step = self.grid_step_for(self.camera.zoom)
+        self.grid_surface = self.render_background(self.grid_step)
+        self.dirty_rects = []
+        self.full_redraw = True
+        self.drawn_selection = set()
+        self.drawn_temp_points = []
+        self.drawn_area_rect = None
+        self.drawn_status = None
+        self.status_surface = None
+        self.status_rect = pygame.Rect(10, self.height - 30, 0, 0)
+
+        # Профилировщик кадра (F3) и его панель
+        self.profiler = FrameProfiler()
+        self.profile_path = profile_path
+        self.perf_overlay = PerfOverlay(self.width - 270, self.height - 140)
+
+        # Файл сцены (Ctrl+S / Ctrl+O)
+        self.scene_path = scene_path
+        self.scene_file = None
+        self.saved_marker = None  # метка истории на момент сохранения или загрузки
+        self.load_warning = None  # (метка,) после предупреждения о несохранённых изменениях
+
+        # История изменений (Ctrl+Z / Ctrl+Y)
+        self.history = History()
+
+        # Булевы операции выполняются в фоне, ESC отменяет
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="tmo")
+        self.tmo_job = None
+
+        # Замер запуска (StartupTimer): отчёт печатается после первого кадра
+        self.startup = startup
+        if startup is not None:
+            startup.mark("editor_init")
+
+    def add_object(self, obj):
+        """Добавляет объект поверх остальных"""
+        self.objects.append(obj)
+        self.index_object(obj)
+        self.invalidate_object(obj)
+
+    def index_object(self, obj, z=None):
+        """Вносит объект в пространственный индекс и в индекс привязки"""
+        self.index.insert(obj, z)
+        self.snap_index.insert(obj)
+        self.vertex_count += obj.length
+
+    def add_created(self, obj):
+        """Добавляет новую фигуру с записью в историю"""
+        self.execute(SceneCommand(self, added=[obj]))
+
+    def remove_object(self, obj):
+        self.objects.remove(obj)
+        self.index.remove(obj)
+        self.snap_index.remove(obj)
+        self.vertex_count -= obj.length
+        self.invalidate_object(obj)
+
+    def remove_objects(self, objects):
+        """Удаляет несколько объектов за один проход по списку"""
+        removed = {obj for obj in objects if obj in self.index}
+        self.objects = [obj for obj in self.objects if obj not in removed]
+        for obj in removed:
+            self.index.remove(obj)
+            self.snap_index.remove(obj)
+            self.vertex_count -= obj.length
+            self.invalidate_object(obj)
+
+    def update_objects(self, objects):
+        """Обновляет пространственный индекс и области перерисовки после изменения объектов"""
+        for obj in objects:
+            if obj in self.index:
+                # прежнее положение; запас индекса задан в мировых единицах и при
+                # отдалении не покрывает контур и маркеры выделения
+                self.invalidate(self.camera.box_to_screen(self.index.boxes[obj], Shape.damage_padding))
+                self.index.update(obj)
+                self.snap_index.update(obj)
+            self.invalidate_object(obj)
+
+    def invalidate(self, rect):
+        """Помечает область экрана для перерисовки"""
+        self.dirty_rects.append(pygame.Rect(rect))
+
+    def invalidate_object(self, obj):
+        """Помечает для перерисовки экранную область объекта"""
+        self.invalidate(obj.damage_rect(self.camera))
+
+    def camera_changed(self):
+        """После сдвига или масштаба вида экран перерисовывается целиком"""
+        step = self.grid_step_for(self.camera.zoom)
+        if step != self.grid_step:
+            self.grid_step = step
+            self.grid_surface = self.render_background(step)
+        self.full_redraw = True
+
+    def save_scene(self, path=None):
+        path = path or self.scene_path
+        try:
+            save_scene(path, self.objects)
+        except OSError as e:
+            self.status = f"Не удалось сохранить сцену: {e}"
+            return
+        self.saved_marker = self.history.marker()
+        self.status = f"Сцена сохранена: {path}"
+
+    def has_unsaved_changes(self):
+        return self.history.marker() is not self.saved_marker
+
+    def request_load_scene(self):
+        """Ctrl+O: при несохранённых изменениях сцена открывается только
+        повторным нажатием, без других правок между нажатиями"""
+        marker = self.history.marker()
+        if self.has_unsaved_changes() and self.load_warning != (marker,):
+            self.load_warning = (marker,)
+            self.status = "Есть несохранённые изменения: Ctrl+O ещё раз — открыть без сохранения"
+            return
+        self.load_scene()
+
+    def load_scene(self, path=None):
+        """Открывает файл сцены; вершины читаются из файла по мере обращения.
+        История очищается, загрузку отменить нельзя"""
+        path = path or self.scene_path
+        try:
+            scene = SceneFile(path)
+        except (OSError, ValueError) as e:
+            self.status = f"Не удалось открыть сцену: {e}"
+            return
+
+        self.objects = []
+        self.vertex_count = 0
+        self.index.clear()
+        self.snap_index.clear()
+        self.selected_objects = []
+        self.history.clear()
+        self.saved_marker = None
+        self.full_redraw = True
+        self.scene_file = scene
+        for obj in scene:
+            self.objects.append(obj)
+            self.index_object(obj)
+        self.status = f"Сцена загружена: {path} ({len(scene)} объектов)"
 
     def clear_screen(self):
         """Удаляет все объекты с холста и сбрасывает выделение."""
-        self.objects.clear()
-        self.selected_objects.clear()
+        self.execute(SceneCommand(self, removed=self.objects))
+        self.selected_objects = []
+        self.full_redraw = True
         self.status = "Экран очищен"
 
-    def handle_events(self):
-        for event in pygame.event.get():
+    def execute(self, command):
+        """Выполняет команду и записывает её в историю"""
+        command.apply(self)
+        self.history.push(command)
+
+    def undo(self):
+        selection = self.history.undo(self)
+        if selection is None:
+            self.status = "Нечего отменять"
+            return
+        self.selected_objects = [obj for obj in selection if obj in self.index]
+        self.status = "Действие отменено"
+
+    def redo(self):
+        selection = self.history.redo(self)
+        if selection is None:
+            self.status = "Нечего повторять"
+            return
+        self.selected_objects = [obj for obj in selection if obj in self.index]
+        self.status = "Действие повторено"
+
+    def handle_events(self, events=None):
+        for event in pygame.event.get() if events is None else events:
             if event.type == pygame.QUIT:
                 return False
 
+            if event.type == pygame.MOUSEMOTION:
+                self.mouse_pos = event.pos
+
             tool = self.toolbar.handle_event(event)
             if tool:
                 self.current_tool = tool
@@ -68,46 +286,104 @@ class GraphicsEditor:
             color = self.palette.handle_event(event)
             if color:
                 self.current_color = color
-                for obj in self.selected_objects:
-                    obj.color = color
+                if self.selected_objects:
+                    self.execute(ColorCommand(self.selected_objects, color))
                 self.status = f"Выбран цвет: {color}"
 
             if event.type == pygame.MOUSEBUTTONDOWN:
-                self.handle_mouse_down(event)
+                if event.button == 2:
+                    self.panning = True
+                else:
+                    self.handle_mouse_down(event)
 
             elif event.type == pygame.MOUSEBUTTONUP:
+                if event.button == 2:
+                    self.panning = False
+                    continue
+                if event.button == 1 and self.selection_area is not None:
+                    self.finish_selection_area()
+                if self.dragging:
+                    self.apply_motion()
+                    self.finish_drag()
                 self.dragging = False
 
+            elif event.type == pygame.MOUSEMOTION and self.panning:
+                self.pan_delta = (self.pan_delta[0] + event.rel[0], self.pan_delta[1] + event.rel[1])
+
             elif event.type == pygame.MOUSEMOTION and self.dragging:
-                self.handle_drag(event)
+                self.drag_target = event.pos
+
+            elif event.type == pygame.MOUSEMOTION and self.selection_area is not None:
+                self.extend_selection_area(event.pos)
+
+            elif event.type == pygame.MOUSEWHEEL:
+                self.camera.zoom_at(1.1 ** event.y, pygame.mouse.get_pos())
+                self.camera_changed()
+                self.status = f"Масштаб: {self.camera.zoom * 100:.0f}%"
 
             elif event.type == pygame.KEYDOWN:
                 self.handle_key_down(event)
 
+            elif event.type == TMO_PROGRESS and event.job is self.tmo_job:
+                self.status = f"{self.tmo_names[event.job.kind]}: {event.job.progress:.0%} (ESC — отмена)"
+
+            elif event.type == TMO_DONE and event.job is self.tmo_job:
+                self.finish_tmo_operation(event.job)
+
+        self.apply_motion()
         return True
 
+    def apply_motion(self):
+        """Применяет накопленные за кадр сдвиг вида и перетаскивание"""
+        if self.pan_delta != (0, 0):
+            self.camera.pan(*self.pan_delta)
+            self.pan_delta = (0, 0)
+            self.camera_changed()
+        if self.drag_target is not None:
+            self.handle_drag(self.drag_target)
+            self.drag_target = None
+
     def handle_mouse_down(self, event):
-        x, y = event.pos
-        if self.toolbar.rect.collidepoint(x, y) or self.palette.rect.collidepoint(x, y):
+        if event.button in (4, 5):  # колесо обрабатывается через MOUSEWHEEL
             return
+        if self.toolbar.rect.collidepoint(event.pos) or self.palette.rect.collidepoint(event.pos):
+            return
+        if self.current_tool in self.snap_tools:
+            x, y = self.snap(event.pos)
+        else:
+            x, y = self.camera.screen_to_world(event.pos)
 
         if self.current_tool == "select":
             if not pygame.key.get_mods() & pygame.KMOD_SHIFT:
                 self.selected_objects = []
 
-            for obj in reversed(self.objects):
-                if obj.contains_point((x, y)):
+            # Кривая задевается и чуть снаружи своего прямоугольника;
+            # допуск задан в пикселях экрана, как радиус привязки
+            tolerance = BezierCurve.hit_tolerance / self.camera.zoom
+            nearby = self.index.query_rect((x - tolerance, y - tolerance, x + tolerance, y + tolerance))
+            for obj in reversed(nearby):
+                if isinstance(obj, BezierCurve):
+                    hit = obj.contains_point((x, y), tolerance)
+                else:
+                    hit = obj.contains_point((x, y))
+                if hit:
                     if obj not in self.selected_objects:
                         self.selected_objects.append(obj)
                     else:
                         self.selected_objects.remove(obj)
                     break
+            else:
+                # Протяжка левой кнопкой с пустого места выделяет рамкой, с Ctrl — лассо;
+                # завершается она отпусканием той же кнопки
+                if event.button == 1:
+                    self.selection_mode = "lasso" if pygame.key.get_mods() & pygame.KMOD_CTRL else "rect"
+                    self.selection_area = [(x, y), (x, y)]
             self.status = f"Выбрано объектов: {len(self.selected_objects)}"
 
         elif self.current_tool == "bezier":
             self.temp_points.append((x, y))
             if len(self.temp_points) == 4:
-                self.objects.append(BezierCurve(self.temp_points, self.current_color))
+                self.add_created(BezierCurve(self.temp_points, self.current_color))
                 self.temp_points = []
                 self.status = "Кривая Безье создана"
             else:
@@ -116,7 +392,7 @@ class GraphicsEditor:
         elif self.current_tool == "triangle":
             self.temp_points.append((x, y))
             if len(self.temp_points) == 2:
-                self.objects.append(RightTriangle(self.temp_points, self.current_color))
+                self.add_created(RightTriangle(self.temp_points, self.current_color))
                 self.temp_points = []
                 self.status = "Треугольник создан"
             else:
@@ -128,41 +404,121 @@ class GraphicsEditor:
                 self.status = f"Вершина {len(self.temp_points)}. Enter - завершить"
             elif event.button == 3:
                 if len(self.temp_points) >= 3:
-                    self.objects.append(Polygon(self.temp_points, self.current_color))
+                    self.add_created(Polygon(self.temp_points, self.current_color))
                     self.temp_points = []
                     self.status = "Многоугольник создан"
 
         elif self.current_tool == "move" and self.selected_objects:
             self.dragging = True
-            self.drag_offset = [(x - obj.position[0], y - obj.position[1]) for obj in self.selected_objects]
+            self.drag_start = (x, y)
+            self.drag_moved = (0, 0)
 
         elif self.current_tool in ["rotate", "scale_x", "scale_xy"]:
             self.temp_points.append((x, y))
             if len(self.temp_points) == 2 and self.selected_objects:
                 self.apply_transformation()
 
-    def handle_drag(self, event):
-        x, y = event.pos
-        for i, obj in enumerate(self.selected_objects):
-            offset_x, offset_y = self.drag_offset[i]
-            obj.move((x - offset_x, y - offset_y))
+    def handle_drag(self, pos):
+        """Переносит выделение под курсор одной матрицей для всех объектов"""
+        x, y = self.camera.screen_to_world(pos)
+        total = (x - self.drag_start[0], y - self.drag_start[1])
+        dx, dy = total[0] - self.drag_moved[0], total[1] - self.drag_moved[1]
+        if not (dx or dy):
+            return
+        Transformation.apply_to_objects(self.selected_objects, Transformation.translation_matrix(dx, dy))
+        self.drag_moved = total
+        self.update_objects(self.selected_objects)
+
+    def finish_drag(self):
+        """Записывает всё перетаскивание в историю одним переносом"""
+        dx, dy = self.drag_moved
+        if dx or dy:
+            self.history.push(TransformCommand(self.selected_objects,
+                                               Transformation.translation_matrix(dx, dy)))
+
+    def extend_selection_area(self, pos):
+        """Тянет угол рамки или добавляет точку лассо под курсором"""
+        point = self.camera.screen_to_world(pos)
+        if self.selection_mode == "rect":
+            self.selection_area[1] = point
+            return
+        last = self.selection_area[-1]
+        if math.hypot(point[0] - last[0], point[1] - last[1]) * self.camera.zoom >= self.lasso_step:
+            self.selection_area.append(point)
+
+    def finish_selection_area(self):
+        """Выделяет объекты внутри рамки или лассо; Shift добавляет к выделению"""
+        area, mode = self.selection_area, self.selection_mode
+        self.selection_area = self.selection_mode = None
+        box = area_box(area)
+        if max(box[2] - box[0], box[3] - box[1]) * self.camera.zoom < self.lasso_step:
+            return  # простой щелчок по пустому месту
+
+        candidates = self.index.query_rect(box)
+        if mode == "rect":
+            found = select_in_rect(candidates, box)
+        else:
+            found = select_in_lasso(candidates, area)
+
+        if pygame.key.get_mods() & pygame.KMOD_SHIFT:
+            selected = set(self.selected_objects)
+            found = self.selected_objects + [obj for obj in found if obj not in selected]
+        self.selected_objects = found
+        self.status = f"Выбрано объектов: {len(self.selected_objects)}"
+
+    def area_rect(self):
+        """Экранная область рамки или лассо (None, если выделения областью нет)"""
+        if self.selection_area is None:
+            return None
+        return self.camera.box_to_screen(area_box(self.selection_area), 2)
 
     def handle_key_down(self, event):
+        # Предупреждение о несохранённых изменениях действует до следующей клавиши
+        load_warning, self.load_warning = self.load_warning, None
         if event.key == pygame.K_RETURN and self.current_tool == "polygon":
             if len(self.temp_points) >= 3:
-                self.objects.append(Polygon(self.temp_points, self.current_color))
+                self.add_created(Polygon(self.temp_points, self.current_color))
                 self.temp_points = []
                 self.status = "Многоугольник создан"
 
         elif event.key == pygame.K_DELETE:
-            for obj in self.selected_objects:
-                if obj in self.objects:
-                    self.objects.remove(obj)
+            self.execute(SceneCommand(self, removed=self.selected_objects))
             self.selected_objects = []
             self.status = "Объекты удалены"
 
+        elif event.key == pygame.K_z and event.mod & pygame.KMOD_CTRL:
+            self.undo()
+
+        elif event.key == pygame.K_y and event.mod & pygame.KMOD_CTRL:
+            self.redo()
+
+        elif event.key == pygame.K_s and event.mod & pygame.KMOD_CTRL:
+            self.save_scene()
+
+        elif event.key == pygame.K_o and event.mod & pygame.KMOD_CTRL:
+            self.load_warning = load_warning
+            self.request_load_scene()
+
+        elif event.key == pygame.K_F3:
+            self.profiler.toggle()
+            self.invalidate(self.perf_overlay.rect)
+            self.status = "Профилировщик включён" if self.profiler.enabled else "Профилировщик выключен"
+
+        elif event.key in self.pan_keys:
+            self.camera.pan(*self.pan_keys[event.key])
+            self.camera_changed()
+
+        elif event.key == pygame.K_HOME:
+            self.camera = Camera()
+            self.camera_changed()
+            self.status = "Вид сброшен"
+
         elif event.key == pygame.K_ESCAPE:
             self.temp_points = []
+            self.selection_area = self.selection_mode = None
+            if self.tmo_job is not None:
+                self.tmo_job.cancel()
+                self.tmo_job = None
             self.status = "Операция отменена"
 
         elif event.key == pygame.K_u:
@@ -177,84 +533,265 @@ class GraphicsEditor:
         center = self.temp_points[0]
         target = self.temp_points[1]
 
-        for obj in self.selected_objects:
-            if self.current_tool == "rotate":
-                angle = Transformation.calculate_angle(center, target)
-                obj.rotate(angle, center)
-                self.status = f"Поворот на {int(angle)}°"
+        if self.current_tool == "rotate":
+            angle = Transformation.calculate_angle(center, target)
+            matrix = Transformation.rotation_matrix(angle, center)
+            self.status = f"Поворот на {int(angle)}°"
 
-            elif self.current_tool == "scale_x":
-                sx = Transformation.calculate_scale(center, target, 'x')
-                obj.scale_x(sx, center)
-                self.status = f"Масштаб по X: {sx:.1f}"
+        elif self.current_tool == "scale_x":
+            sx = Transformation.calculate_scale(center, target, 'x')
+            matrix = Transformation.scale_matrix((sx, 1), center)
+            self.status = f"Масштаб по X: {sx:.1f}"
 
-            elif self.current_tool == "scale_xy":
-                scale = Transformation.calculate_scale(center, target, 'xy')
-                obj.scale_xy(scale, center)
-                self.status = f"Масштаб XY: {scale:.1f}"
+        elif self.current_tool == "scale_xy":
+            scale = Transformation.calculate_scale(center, target, 'xy')
+            matrix = Transformation.scale_matrix((scale, scale), center)
+            self.status = f"Масштаб XY: {scale:.1f}"
 
+        # Одна матрица на всё выделение
+        self.execute(TransformCommand(self.selected_objects, matrix))
         self.temp_points = []
 
     def apply_tmo_operation(self):
-        if len(self.selected_objects) == 2:
-            obj1, obj2 = self.selected_objects
-            if self.current_tool == "union":
-                result = TMOperations.union(obj1, obj2)
-                if result:
-                    self.objects.remove(obj1)
-                    self.objects.remove(obj2)
-                    self.objects.append(result)
-                    self.selected_objects = [result]  # Выбираем новый объект
-                    self.status = "Операция объединения выполнена"
-                    print("Объединение выполнено:", result.points)  # Отладочное сообщение
-                else:
-                    self.status = "Не удалось выполнить объединение"
-                    print("Объединение не удалось")  # Отладочное сообщение
-            elif self.current_tool == "sym_diff":
-                result = TMOperations.symmetric_difference(obj1, obj2)
-                if result:
-                    self.objects.remove(obj1)
-                    self.objects.remove(obj2)
-                    self.objects.append(result)
-                    self.selected_objects = [result]  # Выбираем новый объект
-                    self.status = "Симметрическая разность выполнена"
-                    print("Симметрическая разность выполнена:", result.points)  # Отладочное сообщение
-                else:
-                    self.status = "Не удалось выполнить симметрическую разность"
-                    print("Симметрическая разность не удалась")  # Отладочное сообщение
-        else:
-            self.status = "Выделите ровно 2 объекта для TMO"
-            print("Необходимо выделить ровно 2 объекта")  # Отладочное сообщение
+        """Запускает булеву операцию над выделением в фоновом потоке"""
+        if len(self.selected_objects) < 2:
+            self.status = "Выделите минимум 2 объекта для TMO"
+            return
+        if self.current_tool not in self.tmo_names:
+            return
+        if self.tmo_job is not None:
+            self.status = "Дождитесь завершения операции или нажмите ESC"
+            return
 
-    def run(self):
-        clock = pygame.time.Clock()
-        running = True
+        self.tmo_job = TMOJob(self.executor, self.current_tool, self.selected_objects)
+        self.status = f"{self.tmo_names[self.current_tool]}: выполняется (ESC — отмена)"
 
-        while running:
-            running = self.handle_events()
+    def finish_tmo_operation(self, job):
+        """Подставляет результат фоновой операции вместо исходных фигур одной командой"""
+        self.tmo_job = None
+        if job.kind == "union":
+            done = "Операция объединения выполнена"
+            failed = "Не удалось выполнить объединение"
+        else:
+            done = "Симметрическая разность выполнена"
+            failed = "Не удалось выполнить симметрическую разность"
 
-            self.screen.fill(self.background)
+        if not job.sources_unchanged(self):
+            self.status = "Исходные фигуры изменились, результат отброшен"
+            return
+        try:
+            result = job.result()
+        except Exception as e:
+            self.status = f"{failed}: {e}"
+            return
 
-            for x in range(0, self.width, 20):
-                pygame.draw.line(self.screen, (220, 220, 220), (x, 0), (x, self.height))
-            for y in range(0, self.height, 20):
-                pygame.draw.line(self.screen, (220, 220, 220), (0, y), (self.width, y))
+        if result:
+            self.execute(SceneCommand(self, added=[result], removed=job.sources))
+            self.selected_objects = [result]  # Выбираем новый объект
+            self.status = done
+        else:
+            self.status = failed
+
+    def snap(self, pos):
+        """Мировая точка для позиции курсора с привязкой к ближайшей вершине
+        или середине ребра, иначе к узлу сетки; Alt отключает привязку"""
+        x, y = self.camera.screen_to_world(pos)
+        if pygame.key.get_mods() & pygame.KMOD_ALT:
+            return x, y
+
+        radius = self.snap_radius / self.camera.zoom
+        point = self.snap_index.nearest((x, y), radius)
+        if point is not None:
+            return point
+
+        step = self.grid_world_step(self.camera.zoom)
+        node = (round(x / step) * step, round(y / step) * step)
+        if math.hypot(node[0] - x, node[1] - y) <= radius:
+            return node
+        return x, y
+
+    @staticmethod
+    def grid_world_step(zoom):
+        """Шаг сетки в мировых единицах: 20, прореженный или уплотнённый вдвое,
+        чтобы на экране между линиями было от 10 до 160 пикселей"""
+        step = 20.0
+        while step * zoom < 10:
+            step *= 2
+        while step * zoom > 160:
+            step /= 2
+        return step
+
+    @classmethod
+    def grid_step_for(cls, zoom):
+        """Шаг сетки на экране, пиксели"""
+        return round(cls.grid_world_step(zoom) * zoom)
+
+    def render_background(self, step=20):
+        """Фон с сеткой отрисовывается один раз на шаг сетки (с запасом в шаг для сдвига)"""
+        width, height = self.width + step, self.height + step
+        surface = pygame.Surface((width, height))
+        surface.fill(self.background)
+        for x in range(0, width, step):
+            pygame.draw.line(surface, (220, 220, 220), (x, 0), (x, height))
+        for y in range(0, height, step):
+            pygame.draw.line(surface, (220, 220, 220), (0, y), (width, y))
+        return surface
+
+    def grid_offset(self):
+        """Смещение фона сетки, при котором линии следуют за камерой"""
+        step = self.grid_step
+        return (round(self.camera.x * self.camera.zoom) % step,
+                round(self.camera.y * self.camera.zoom) % step)
+
+    def collect_damage(self):
+        """Добавляет области, изменившиеся из-за выделения, временных точек и статуса"""
+        selection = set(self.selected_objects)
+        for obj in selection ^ self.drawn_selection:
+            self.invalidate_object(obj)
+        self.drawn_selection = selection
+
+        if self.temp_points != self.drawn_temp_points:
+            for point in self.drawn_temp_points + self.temp_points:
+                x, y = self.camera.point_to_screen(point)
+                self.invalidate(pygame.Rect(int(x) - 6, int(y) - 6, 14, 14))
+            self.drawn_temp_points = list(self.temp_points)
+
+        area_rect = self.area_rect()
+        if area_rect != self.drawn_area_rect:
+            for rect in (self.drawn_area_rect, area_rect):
+                if rect is not None:
+                    self.invalidate(rect)
+            self.drawn_area_rect = area_rect
+
+        if self.toolbar.update_state(self.current_tool, self.mouse_pos):
+            self.invalidate(self.toolbar.rect)
+        if self.palette.update_state(self.current_color, self.mouse_pos):
+            self.invalidate(self.palette.rect)
+
+        if self.status != self.drawn_status:
+            self.status_surface = self.text_cache.render(self.status, (0, 0, 0))
+            self.invalidate(self.status_rect)
+            self.status_rect = self.status_surface.get_rect(topleft=(10, self.height - 30))
+            self.invalidate(self.status_rect)
+            self.drawn_status = self.status
+
+        if self.profiler.enabled:
+            self.invalidate(self.perf_overlay.rect)
+
+    @staticmethod
+    def merge_rects(rects):
+        """Объединяет пересекающиеся прямоугольники, чтобы каждая область рисовалась один раз"""
+        merged = []
+        for rect in rects:
+            if not (rect.width and rect.height):
+                continue
+            index = rect.collidelist(merged)
+            while index != -1:
+                rect = rect.union(merged.pop(index))
+                index = rect.collidelist(merged)
+            merged.append(rect)
+        return merged
+
+    def render(self):
+        """Перерисовывает только повреждённые области и выводит их на экран"""
+        self.collect_damage()
+        screen_rect = self.screen.get_rect()
+
+        if self.full_redraw:
+            rects = [screen_rect]
+        else:
+            rects = self.merge_rects(r.clip(screen_rect) for r in self.dirty_rects)
+            if len(rects) > 16:
+                rects = [rects[0].unionall(rects[1:])]
 
-            for obj in self.objects:
-                obj.draw(self.screen)
-                if obj in self.selected_objects:
-                    obj.draw_selection(self.screen)
+        self.dirty_rects = []
+        if not rects:
+            return
 
-            for point in self.temp_points:
-                pygame.draw.circle(self.screen, (255, 0, 0), point, 5)
+        lap = self.profiler.lap if self.profiler.enabled else no_lap
+        for rect in rects:
+            self.screen.set_clip(rect)
+            self.draw_region(rect, lap)
 
+        self.screen.set_clip(None)
+        if self.full_redraw:
+            pygame.display.flip()
+        else:
+            pygame.display.update(rects)
+        self.full_redraw = False
+        lap("display")
+
+    def draw_region(self, rect, lap):
+        """Рисует всё, что попадает в область; lap относит прошедшее время к фазе"""
+        self.screen.blit(self.grid_surface, rect, rect.move(self.grid_offset()))
+        lap("grid")
+
+        # Отсечение по видимой области: объекты вне её не рисуются вовсе.
+        # Запас в пикселях покрывает контур и маркеры выделения при любом масштабе.
+        camera = self.camera
+        view = camera.rect_to_world(rect.inflate(2 * Shape.damage_padding, 2 * Shape.damage_padding))
+        for obj in self.index.query_rect(view):
+            obj.draw(self.screen, camera)
+            lap("draw:" + type(obj).__name__)
+            if obj in self.drawn_selection:
+                obj.draw_selection(self.screen, camera)
+                lap("draw_selection")
+
+        for point in self.temp_points:
+            pygame.draw.circle(self.screen, (255, 0, 0), camera.point_to_screen(point), 5)
+
+        if self.selection_area is not None:
+            if self.selection_mode == "rect":
+                (x1, y1), (x2, y2) = camera.world_to_screen(self.selection_area)
+                area = pygame.Rect(min(x1, x2), min(y1, y2), abs(x2 - x1), abs(y2 - y1))
+                pygame.draw.rect(self.screen, (60, 110, 220), area, 1)
+            elif len(self.selection_area) > 1:
+                pygame.draw.lines(self.screen, (60, 110, 220), True,
+                                  camera.world_to_screen(self.selection_area), 1)
+
+        if self.toolbar.rect.colliderect(rect):
             self.toolbar.draw(self.screen)
+        if self.palette.rect.colliderect(rect):
             self.palette.draw(self.screen)
+        if self.status_rect.colliderect(rect):
+            self.screen.blit(self.status_surface, self.status_rect)
+        lap("toolbar_palette")
 
-            status_surface = self.font.render(self.status, True, (0, 0, 0))
-            self.screen.blit(status_surface, (10, self.height - 30))
+        if self.profiler.enabled and self.perf_overlay.rect.colliderect(rect):
+            self.perf_overlay.draw(self.screen, self.profiler, len(self.objects), self.vertex_count)
+            lap("overlay")
 
-            pygame.display.flip()
-            clock.tick(60)
+    def is_idle(self):
+        """Нечего перерисовывать и нечего анимировать"""
+        return not (self.full_redraw or self.dirty_rects or self.profiler.enabled)
+
+    def run(self):
+        """Главный цикл: кадр рисуется только после изменений, в покое поток
+        спит в ожидании события, при работе частота ограничена max_fps"""
+        clock = pygame.time.Clock()
+        running = True
 
+        while running:
+            if self.is_idle():
+                events = [pygame.event.wait()]
+                events.extend(pygame.event.get())
+            else:
+                events = pygame.event.get()
+
+            self.profiler.begin_frame()
+            running = self.handle_events(events)
+            if self.profiler.enabled:
+                self.profiler.lap("handle_events")
+            self.render()
+            self.profiler.end_frame()
+            if self.startup is not None:
+                self.startup.mark("first_frame")
+                print(self.startup.report())
+                self.startup = None
+            clock.tick(self.max_fps)
+
+        if self.tmo_job is not None:
+            self.tmo_job.cancel()
+        self.executor.shutdown(wait=False, cancel_futures=True)
+        self.profiler.dump(self.profile_path)
         pygame.quit()
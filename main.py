@@ -1,10 +1,22 @@
+import sys
+import time
+
+START = time.perf_counter()
+
 import pygame
 from editor import GraphicsEditor
+from profiler import StartupTimer
 
 def main():
+    # --startup-time: печать времени запуска по этапам после первого кадра
+    startup = StartupTimer(START) if "--startup-time" in sys.argv else None
+    if startup is not None:
+        startup.mark("imports")
     pygame.init()
-    editor = GraphicsEditor(1348, 640)
+    if startup is not None:
+        startup.mark("pygame_init")
+    editor = GraphicsEditor(1348, 640, startup=startup)
     editor.run()
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -0,0 +1,65 @@
+import threading
+
+import pygame
+from operations.tmo import TMOperations
+
+# События, которыми рабочий поток будит главный цикл
+TMO_PROGRESS = pygame.USEREVENT + 1
+TMO_DONE = pygame.USEREVENT + 2
+
+
+class TMOJob:
+    """Булева операция над выделением, выполняемая в пуле потоков.
+
+    Геометрии исходных фигур снимаются на главном потоке при запуске;
+    рабочий поток работает только с ними (Shapely отпускает GIL) и
+    сообщает о ходе и завершении событиями pygame. Фигура-результат
+    создаётся уже на главном потоке в result().
+    """
+
+    operations = {
+        "union": (TMOperations.union_geometry, TMOperations.union_shape),
+        "sym_diff": (TMOperations.symmetric_difference_geometry, TMOperations.symmetric_difference_shape),
+    }
+
+    def __init__(self, executor, kind, sources):
+        self.kind = kind
+        self.sources = list(sources)
+        self.color = self.sources[0].color
+        self.geometries = [obj.shapely_geometry() for obj in self.sources]
+        self.progress = 0.0
+        self.cancelled = threading.Event()
+        self.future = executor.submit(self.compute)
+        self.future.add_done_callback(self.finished)
+
+    def compute(self):
+        compute, _ = self.operations[self.kind]
+        return compute(list(self.geometries), self.cancelled, self.report)
+
+    def report(self, fraction):
+        self.progress = fraction
+        self.post(TMO_PROGRESS)
+
+    def finished(self, future):
+        if not future.cancelled():
+            self.post(TMO_DONE)
+
+    def post(self, event_type):
+        try:
+            pygame.event.post(pygame.event.Event(event_type, job=self))
+        except pygame.error:
+            pass  # окно уже закрыто
+
+    def cancel(self):
+        self.cancelled.set()
+        self.future.cancel()
+
+    def sources_unchanged(self, editor):
+        """Исходные фигуры на месте и не менялись с момента запуска"""
+        return all(obj in editor.index and obj.shapely_geometry() is geometry
+                   for obj, geometry in zip(self.sources, self.geometries))
+
+    def result(self):
+        """Фигура-результат (None, если результат пуст); вызывается на главном потоке"""
+        _, build = self.operations[self.kind]
+        return build(self.future.result(), self.color)
@@ -0,0 +1,115 @@
+from collections import deque
+
+import numpy as np
+from operations.transformations import Transformation
+
+
+class TransformCommand:
+    """Аффинное преобразование набора объектов; отмена — обратная матрица"""
+
+    def __init__(self, objects, matrix):
+        self.objects = list(objects)
+        self.matrix = matrix
+
+    def apply(self, editor):
+        Transformation.apply_to_objects(self.objects, self.matrix)
+        editor.update_objects(self.objects)
+        return self.objects
+
+    def revert(self, editor):
+        Transformation.apply_to_objects(self.objects, np.linalg.inv(self.matrix))
+        editor.update_objects(self.objects)
+        return self.objects
+
+
+class ColorCommand:
+    """Смена цвета; хранит только прежние цвета"""
+
+    def __init__(self, objects, color):
+        self.objects = list(objects)
+        self.old_colors = [obj.color for obj in self.objects]
+        self.color = color
+
+    def apply(self, editor):
+        for obj in self.objects:
+            obj.color = self.color
+            editor.invalidate_object(obj)
+        return self.objects
+
+    def revert(self, editor):
+        for obj, color in zip(self.objects, self.old_colors):
+            obj.color = color
+            editor.invalidate_object(obj)
+        return self.objects
+
+
+class SceneCommand:
+    """Добавление и удаление объектов.
+
+    Удалённые объекты запоминаются вместе с местом в списке и порядком
+    отрисовки; вершины не копируются, объекты просто остаются живыми.
+    Создаётся до выполнения, пока объекты ещё на сцене.
+    """
+
+    def __init__(self, editor, added=(), removed=()):
+        self.added = list(added)
+        removed = set(removed)
+        self.removed = [(position, editor.index.z_order[obj], obj)
+                        for position, obj in enumerate(editor.objects) if obj in removed]
+
+    def apply(self, editor):
+        editor.remove_objects([obj for _, _, obj in self.removed])
+        for obj in self.added:
+            editor.add_object(obj)
+        return self.added
+
+    def revert(self, editor):
+        editor.remove_objects(self.added)
+
+        # Возвращаем удалённые объекты на прежние места за один проход
+        current = iter(editor.objects)
+        objects = []
+        for position, z, obj in self.removed:
+            while len(objects) < position:
+                objects.append(next(current))
+            objects.append(obj)
+            editor.index_object(obj, z)
+            editor.invalidate_object(obj)
+        objects.extend(current)
+        editor.objects = objects
+        return [obj for _, _, obj in self.removed]
+
+
+class History:
+    """Стек отмены/повтора из компактных команд"""
+
+    def __init__(self, limit=200):
+        self.undo_stack = deque(maxlen=limit)
+        self.redo_stack = []
+
+    def push(self, command):
+        """Записывает уже выполненную команду"""
+        self.undo_stack.append(command)
+        self.redo_stack.clear()
+
+    def clear(self):
+        self.undo_stack.clear()
+        self.redo_stack.clear()
+
+    def marker(self):
+        """Метка текущего состояния: последняя выполненная команда (None — исходное)"""
+        return self.undo_stack[-1] if self.undo_stack else None
+
+    def undo(self, editor):
+        if not self.undo_stack:
+            return None
+        command = self.undo_stack.pop()
+        self.redo_stack.append(command)
+        return command.revert(editor)
+
+    def redo(self, editor):
+        if not self.redo_stack:
+            return None
+        command = self.redo_stack.pop()
+        self.undo_stack.append(command)
+        return command.apply(editor)
@@ -0,0 +1,161 @@
+import numpy as np
+
+CHUNK = 4096  # пар отрезков за одну векторную проверку при поиске первого пересечения
+POINT_CHUNK = 1 << 16  # пар «точка — ребро», проверяемых попаданием в контур за одну операцию
+
+
+def ring_segments(points):
+    """Начала и концы рёбер замкнутого контура"""
+    points = np.asarray(points, dtype=np.float64).reshape(-1, 2)
+    return points, np.roll(points, -1, axis=0)
+
+
+def point_segment_distances(point, starts, ends):
+    """Расстояния от точки до каждого из отрезков [starts[i], ends[i]]"""
+    point = np.asarray(point, dtype=np.float64)
+    direction = ends - starts
+    offsets = point - starts
+    length2 = np.einsum("ij,ij->i", direction, direction)
+    # У вырожденных отрезков (length2 == 0) t = 0, расстояние до начала
+    t = np.einsum("ij,ij->i", offsets, direction) / np.where(length2 > 0, length2, 1)
+    d = offsets - np.clip(t, 0, 1)[:, None] * direction
+    return np.hypot(d[:, 0], d[:, 1])
+
+
+def points_in_polygon(points, polygon, successors=None):
+    """Маска точек (N, 2), лежащих внутри замкнутого контура (правило чёт-нечет).
+
+    Если пар «точка — ребро» не больше POINT_CHUNK, все они проверяются
+    одной операцией. Иначе точки сортируются по y, и каждое ребро меняет
+    чётность только у точек своей полосы по y (границы полосы находит
+    searchsorted). successors задаёт следующую вершину для набора
+    контуров (см. ring_successors), без него вершины polygon образуют
+    один контур.
+    """
+    points = np.asarray(points, dtype=np.float64).reshape(-1, 2)
+    start = np.asarray(polygon, dtype=np.float64).reshape(-1, 2)
+    if len(start) < 3 or not len(points):
+        return np.zeros(len(points), dtype=bool)
+    end = start[successors] if successors is not None else np.roll(start, -1, axis=0)
+    dy = end[:, 1] - start[:, 1]
+    # Горизонтальные рёбра луч не пересекают, их наклон не используется
+    slope = (end[:, 0] - start[:, 0]) / np.where(dy != 0, dy, 1)
+
+    if len(points) * len(start) <= POINT_CHUNK:
+        x, y = points[:, 0:1], points[:, 1:2]
+        crossing = (start[:, 1] > y) != (end[:, 1] > y)
+        x_cross = start[:, 0] + (y - start[:, 1]) * slope
+        return np.count_nonzero(crossing & (x < x_cross), axis=1) % 2 == 1
+
+    order = np.argsort(points[:, 1], kind="stable")
+    xs, ys = points[order, 0], points[order, 1]
+    # Ребро пересекает горизонталь y, если min(y1, y2) <= y < max(y1, y2)
+    lows = np.searchsorted(ys, np.minimum(start[:, 1], end[:, 1]), side="left")
+    highs = np.searchsorted(ys, np.maximum(start[:, 1], end[:, 1]), side="left")
+    parity = np.zeros(len(points), dtype=bool)
+    for i in np.flatnonzero(highs > lows).tolist():
+        low, high = lows[i], highs[i]
+        x_cross = start[i, 0] + (ys[low:high] - start[i, 1]) * slope[i]
+        parity[low:high] ^= xs[low:high] < x_cross
+
+    inside = np.empty(len(points), dtype=bool)
+    inside[order] = parity
+    return inside
+
+
+def _expand(starts, stops):
+    """Разворачивает диапазоны [starts[i], stops[i]) в пары (i, k)"""
+    counts = np.maximum(stops - starts, 0)
+    owners = np.repeat(np.arange(len(starts)), counts)
+    offsets = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+    return owners, np.repeat(starts, counts) + offsets
+
+
+def candidate_pairs(a0, a1, b0, b1):
+    """Пары рёбер двух наборов с пересекающимися ограничивающими прямоугольниками.
+
+    Заметание по оси x: после сортировки по левому краю для каждого
+    отрезка берутся только отрезки другого набора, начинающиеся внутри
+    его x-интервала, затем пары отсеиваются по y.
+    """
+    ax_min = np.minimum(a0[:, 0], a1[:, 0])
+    ax_max = np.maximum(a0[:, 0], a1[:, 0])
+    bx_min = np.minimum(b0[:, 0], b1[:, 0])
+    bx_max = np.maximum(b0[:, 0], b1[:, 0])
+
+    # Отрезки b, начинающиеся в [ax_min, ax_max]
+    order_b = np.argsort(bx_min, kind="stable")
+    sorted_b = bx_min[order_b]
+    ia1, k = _expand(np.searchsorted(sorted_b, ax_min, "left"),
+                     np.searchsorted(sorted_b, ax_max, "right"))
+    ib1 = order_b[k]
+
+    # Отрезки a, начинающиеся в (bx_min, bx_max]
+    order_a = np.argsort(ax_min, kind="stable")
+    sorted_a = ax_min[order_a]
+    ib2, k = _expand(np.searchsorted(sorted_a, bx_min, "right"),
+                     np.searchsorted(sorted_a, bx_max, "right"))
+    ia2 = order_a[k]
+
+    ia = np.concatenate([ia1, ia2])
+    ib = np.concatenate([ib1, ib2])
+
+    ay_min = np.minimum(a0[ia, 1], a1[ia, 1])
+    ay_max = np.maximum(a0[ia, 1], a1[ia, 1])
+    by_min = np.minimum(b0[ib, 1], b1[ib, 1])
+    by_max = np.maximum(b0[ib, 1], b1[ib, 1])
+    keep = (ay_min <= by_max) & (by_min <= ay_max)
+    return ia[keep], ib[keep]
+
+
+def _orientation(p, q, r):
+    return np.sign((q[:, 1] - p[:, 1]) * (r[:, 0] - q[:, 0]) - (q[:, 0] - p[:, 0]) * (r[:, 1] - q[:, 1]))
+
+
+def _crossing(p1, p2, p3, p4):
+    """Векторный аналог TMOperations.lines_intersect"""
+    return ((_orientation(p1, p2, p3) != _orientation(p1, p2, p4)) &
+            (_orientation(p3, p4, p1) != _orientation(p3, p4, p2)))
+
+
+def segments_intersect(a0, a1, b0, b1):
+    """Есть ли хотя бы одна пара пересекающихся отрезков (с ранним выходом)"""
+    ia, ib = candidate_pairs(a0, a1, b0, b1)
+    for start in range(0, len(ia), CHUNK):
+        i = ia[start:start + CHUNK]
+        j = ib[start:start + CHUNK]
+        if _crossing(a0[i], a1[i], b0[j], b1[j]).any():
+            return True
+    return False
+
+
+def segment_intersections(a0, a1, b0, b1):
+    """Все точки пересечения отрезков двух наборов.
+
+    Возвращает индексы пар (ia, ib) и точки (k, 2) в порядке (ia, ib).
+    """
+    ia, ib = candidate_pairs(a0, a1, b0, b1)
+    order = np.lexsort((ib, ia))
+    ia, ib = ia[order], ib[order]
+
+    p1, p2, p3, p4 = a0[ia], a1[ia], b0[ib], b1[ib]
+    denom = (p2[:, 1] - p1[:, 1]) * (p4[:, 0] - p3[:, 0]) - (p2[:, 0] - p1[:, 0]) * (p4[:, 1] - p3[:, 1])
+    hit = _crossing(p1, p2, p3, p4) & (denom != 0)
+    ia, ib, denom = ia[hit], ib[hit], denom[hit]
+    p1, p2, p3, p4 = p1[hit], p2[hit], p3[hit], p4[hit]
+
+    cross_a = p2[:, 0] * p1[:, 1] - p2[:, 1] * p1[:, 0]
+    cross_b = p4[:, 0] * p3[:, 1] - p4[:, 1] * p3[:, 0]
+    x = ((p2[:, 0] - p1[:, 0]) * cross_b - (p4[:, 0] - p3[:, 0]) * cross_a) / denom
+    y = ((p2[:, 1] - p1[:, 1]) * cross_b - (p4[:, 1] - p3[:, 1]) * cross_a) / denom
+    return ia, ib, np.column_stack([x, y])
+
+
+def rings_intersect(points1, points2):
+    """Пересекаются ли контуры двух многоугольников"""
+    return segments_intersect(*ring_segments(points1), *ring_segments(points2))
+
+
+def ring_intersection_points(points1, points2):
+    """Точки пересечения контуров двух многоугольников"""
+    return segment_intersections(*ring_segments(points1), *ring_segments(points2))[2]
@@ -0,0 +1,52 @@
+import numpy as np
+
+from operations.intersections import points_in_polygon
+
+
+def area_box(points):
+    """Ограничивающий прямоугольник (x_min, y_min, x_max, y_max) точек области"""
+    points = np.asarray(points, dtype=np.float64).reshape(-1, 2)
+    x_min, y_min = points.min(axis=0)
+    x_max, y_max = points.max(axis=0)
+    return float(x_min), float(y_min), float(x_max), float(y_max)
+
+
+def boxes_inside(objects, box):
+    """Маска объектов, чей ограничивающий прямоугольник целиком внутри box"""
+    if not objects:
+        return np.zeros(0, dtype=bool)
+    boxes = np.array([obj.bounding_box() for obj in objects], dtype=np.float64)
+    x_min, y_min, x_max, y_max = box
+    return ((boxes[:, 0] >= x_min) & (boxes[:, 1] >= y_min) &
+            (boxes[:, 2] <= x_max) & (boxes[:, 3] <= y_max))
+
+
+def select_in_rect(objects, box):
+    """Объекты, целиком попавшие в прямоугольник выделения"""
+    return [obj for obj, inside in zip(objects, boxes_inside(objects, box).tolist()) if inside]
+
+
+def select_in_lasso(objects, lasso):
+    """Объекты, все вершины которых лежат внутри замкнутого контура lasso.
+
+    Сначала отбрасываются объекты, не помещающиеся в прямоугольник лассо.
+    Вершины остальных собираются из общих хранилищ одним индексированием
+    (как в Transformation.apply_to_objects), проверяются одним вызовом
+    points_in_polygon и сводятся по объектам через logical_and.reduceat.
+    У кривых Безье проверяются контрольные точки.
+    """
+    lasso = np.asarray(lasso, dtype=np.float64).reshape(-1, 2)
+    if len(lasso) < 3:
+        return []
+    groups = {}
+    for obj in select_in_rect(objects, area_box(lasso)):
+        if obj.length:
+            groups.setdefault(obj.store, []).append(obj)
+
+    selected = []
+    for store, group in groups.items():
+        lengths = np.fromiter((obj.length for obj in group), dtype=np.intp, count=len(group))
+        inside = points_in_polygon(store.data[store.indices(group)], lasso)
+        whole = np.logical_and.reduceat(inside, np.cumsum(lengths) - lengths)
+        selected.extend(obj for obj, chosen in zip(group, whole.tolist()) if chosen)
+    return selected
@@ -0,0 +1,64 @@
+import numpy as np
+
+
+def segment_distances(points, start, end):
+    """Расстояния от точек (N, 2) до отрезка [start, end]"""
+    direction = end - start
+    length2 = direction @ direction
+    offsets = points - start
+    if length2 == 0:
+        return np.hypot(offsets[:, 0], offsets[:, 1])
+    t = np.clip(offsets @ direction / length2, 0, 1)
+    d = offsets - t[:, None] * direction
+    return np.hypot(d[:, 0], d[:, 1])
+
+
+def douglas_peucker_mask(points, tolerance):
+    """Маска вершин ломаной, остающихся после упрощения Дугласа — Пекера.
+
+    Концы сохраняются всегда; остальные вершины отклоняются от
+    упрощённой ломаной не более чем на tolerance. Рекурсия заменена
+    стеком, расстояния на каждом участке считаются одной операцией.
+    """
+    n = len(points)
+    keep = np.zeros(n, dtype=bool)
+    keep[0] = keep[-1] = True
+    stack = [(0, n - 1)]
+    while stack:
+        first, last = stack.pop()
+        if last - first < 2:
+            continue
+        distances = segment_distances(points[first + 1:last], points[first], points[last])
+        i = int(distances.argmax())
+        if distances[i] > tolerance:
+            split = first + 1 + i
+            keep[split] = True
+            stack.append((first, split))
+            stack.append((split, last))
+    return keep
+
+
+def simplify_ring(points, tolerance):
+    """Упрощённый замкнутый контур (не менее трёх вершин).
+
+    Контур разрезается в первой вершине и в самой удалённой от неё,
+    обе половины упрощаются как ломаные.
+    """
+    points = np.asarray(points, dtype=np.float64)
+    n = len(points)
+    if n <= 3:
+        return points
+    offsets = points - points[0]
+    far = int(np.hypot(offsets[:, 0], offsets[:, 1]).argmax())
+    closed = np.vstack([points, points[:1]])
+    keep = np.zeros(n + 1, dtype=bool)
+    keep[:far + 1] = douglas_peucker_mask(closed[:far + 1], tolerance)
+    keep[far:] |= douglas_peucker_mask(closed[far:], tolerance)
+    keep = keep[:n]
+    if keep.sum() < 3:
+        # Контур меньше допуска: оставляем треугольник из крайних точек
+        distances = segment_distances(points, points[0], points[far])
+        keep[int(distances.argmax())] = True
+        if keep.sum() < 3:
+            return points
+    return points[keep]
@@ -0,0 +1,170 @@
+import math
+
+import numpy as np
+
+
+class KDTree:
+    """Статическое k-d дерево над точками (N, 2) без явных узлов.
+
+    Узел — диапазон [start, end) переставленных точек. Точка-медиана
+    mid = (start + end) // 2 (по оси x на чётной глубине, по y на нечётной)
+    принадлежит самому узлу, потомки — [start, mid) и [mid + 1, end).
+    Диапазоны не длиннее leaf_size — листья, они просматриваются одной
+    векторной операцией.
+    """
+
+    def __init__(self, points, leaf_size=128):
+        self.points = np.asarray(points, dtype=np.float64).reshape(-1, 2)
+        self.leaf_size = leaf_size
+        order = np.arange(len(self.points))
+        stack = [(0, len(order), 0)]
+        while stack:
+            start, end, depth = stack.pop()
+            if end - start <= leaf_size:
+                continue
+            mid = (start + end) // 2
+            segment = order[start:end]
+            order[start:end] = segment[np.argpartition(self.points[segment, depth % 2], mid - start)]
+            stack.append((start, mid, depth + 1))
+            stack.append((mid + 1, end, depth + 1))
+        self.order = order
+        self.sorted = self.points[order]
+
+    def __len__(self):
+        return len(self.points)
+
+    def nearest(self, point, radius=math.inf, valid=None):
+        """Номер ближайшей точки не дальше radius (или None) и расстояние до неё.
+
+        valid — необязательная маска по исходным номерам точек: точки с
+        False пропускаются.
+        """
+        x, y = float(point[0]), float(point[1])
+        best = radius * radius
+        best_index = None
+        stack = [(0, len(self.sorted), 0, 0.0)]
+        while stack:
+            start, end, depth, bound = stack.pop()
+            if bound > best:
+                continue
+            if end - start <= self.leaf_size:
+                block = self.sorted[start:end]
+                distances = (block[:, 0] - x) ** 2 + (block[:, 1] - y) ** 2
+                if valid is not None:
+                    distances[~valid[self.order[start:end]]] = math.inf
+                if not len(distances):
+                    continue
+                i = int(distances.argmin())
+                if distances[i] <= best:
+                    best = float(distances[i])
+                    best_index = int(self.order[start + i])
+                continue
+
+            mid = (start + end) // 2
+            mx, my = self.sorted[mid].tolist()
+            distance = (mx - x) ** 2 + (my - y) ** 2
+            if distance <= best and (valid is None or valid[self.order[mid]]):
+                best = distance
+                best_index = int(self.order[mid])
+
+            diff = x - mx if depth % 2 == 0 else y - my
+            # Дальняя половина проверяется, только если до плоскости раздела ближе найденного
+            if diff >= 0:
+                stack.append((start, mid, depth + 1, diff * diff))
+                stack.append((mid + 1, end, depth + 1, 0.0))
+            else:
+                stack.append((mid + 1, end, depth + 1, diff * diff))
+                stack.append((start, mid, depth + 1, 0.0))
+
+        if best_index is None:
+            return None, math.inf
+        return best_index, math.sqrt(best)
+
+
+class SnapIndex:
+    """Точки привязки всех объектов сцены (вершины и середины рёбер).
+
+    Основная часть точек лежит в k-d дереве. Изменённые и новые объекты
+    попадают в буфер и проверяются перебором, а их прежние точки в дереве
+    помечаются недействительными; дерево перестраивается, когда буфер и
+    недействительные точки становятся заметной долей дерева.
+    """
+
+    def __init__(self, rebuild_ratio=0.25, min_rebuild=4096):
+        self.rebuild_ratio = rebuild_ratio
+        self.min_rebuild = min_rebuild
+        self.objects = set()
+        self.pending = set()
+        self.tree = None
+        self.valid = None
+        self.ranges = {}       # объект -> диапазон его точек в дереве
+        self.stale_count = 0
+        self.buffer = None     # точки объектов из буфера, до следующего изменения
+
+    def clear(self):
+        self.objects.clear()
+        self.pending.clear()
+        self.buffer = None
+        self.tree = None
+        self.valid = None
+        self.ranges.clear()
+        self.stale_count = 0
+
+    def insert(self, obj):
+        self.objects.add(obj)
+        self._invalidate(obj)
+        self.pending.add(obj)
+
+    def update(self, obj):
+        """Объект изменился: его точки берутся из буфера до перестройки дерева"""
+        if obj in self.objects:
+            self._invalidate(obj)
+            self.pending.add(obj)
+
+    def remove(self, obj):
+        self.objects.discard(obj)
+        self.pending.discard(obj)
+        self._invalidate(obj)
+
+    def _invalidate(self, obj):
+        self.buffer = None
+        span = self.ranges.pop(obj, None)
+        if span is not None:
+            self.valid[span[0]:span[1]] = False
+            self.stale_count += span[1] - span[0]
+
+    def rebuild(self):
+        objects = list(self.objects)
+        arrays = [obj.snap_points() for obj in objects]
+        ends = np.cumsum([len(points) for points in arrays]).tolist()
+        starts = [0] + ends[:-1]
+        self.ranges = dict(zip(objects, zip(starts, ends)))
+        self.tree = KDTree(np.vstack(arrays) if arrays else np.empty((0, 2)))
+        self.valid = np.ones(len(self.tree), dtype=bool)
+        self.pending.clear()
+        self.buffer = None
+        self.stale_count = 0
+
+    def nearest(self, point, radius):
+        """Ближайшая точка привязки не дальше radius или None"""
+        if self.buffer is None and self.pending:
+            self.buffer = np.vstack([obj.snap_points() for obj in self.pending])
+        changed = self.stale_count + (len(self.buffer) if self.buffer is not None else 0)
+        tree_size = len(self.tree) if self.tree is not None else 0
+        if self.tree is None or changed > max(self.min_rebuild, self.rebuild_ratio * tree_size):
+            self.rebuild()
+
+        best = None
+        index, distance = self.tree.nearest(point, radius, self.valid)
+        if index is not None:
+            best = self.tree.points[index]
+            radius = distance
+
+        if self.buffer is not None:
+            points = self.buffer
+            distances = np.hypot(points[:, 0] - point[0], points[:, 1] - point[1])
+            i = int(distances.argmin())
+            if distances[i] <= radius:
+                best = points[i]
+
+        return None if best is None else (float(best[0]), float(best[1]))
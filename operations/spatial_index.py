@@ -0,0 +1,112 @@
+import math
+
+
+class SpatialGrid:
+    """Равномерная сетка по ограничивающим прямоугольникам объектов.
+
+    Хранит для каждой ячейки множество объектов, чей прямоугольник её
+    задевает, и порядок отрисовки (z) каждого объекта.
+    """
+
+    def __init__(self, cell_size=64, margin=10, max_cells=256):
+        self.cell_size = cell_size
+        self.margin = margin          # запас вокруг прямоугольника объекта, мировые единицы
+        self.max_cells = max_cells    # объекты крупнее проверяются всегда
+        self.cells = {}
+        self.object_cells = {}
+        self.boxes = {}
+        self.large = set()
+        self.z_order = {}
+        self.next_z = 0
+
+    def __len__(self):
+        return len(self.z_order)
+
+    def __contains__(self, obj):
+        return obj in self.z_order
+
+    def clear(self):
+        self.cells.clear()
+        self.object_cells.clear()
+        self.boxes.clear()
+        self.large.clear()
+        self.z_order.clear()
+        self.next_z = 0
+
+    def cell_range(self, box):
+        x_min, y_min, x_max, y_max = box
+        size = self.cell_size
+        return (math.floor(x_min / size), math.floor(y_min / size),
+                math.floor(x_max / size), math.floor(y_max / size))
+
+    def insert(self, obj, z=None):
+        """Добавление объекта; без z объект оказывается поверх остальных"""
+        if z is None:
+            z = self.next_z
+        self.next_z = max(self.next_z, z + 1)
+        self.z_order[obj] = z
+        self._place(obj)
+
+    def remove(self, obj):
+        if obj not in self.z_order:
+            return
+        self._unplace(obj)
+        del self.z_order[obj]
+
+    def update(self, obj):
+        """Перестроение ячеек объекта после перемещения или преобразования"""
+        if obj not in self.z_order:
+            return
+        self._unplace(obj)
+        self._place(obj)
+
+    def _place(self, obj):
+        x_min, y_min, x_max, y_max = obj.bounding_box()
+        m = self.margin
+        box = (x_min - m, y_min - m, x_max + m, y_max + m)
+        self.boxes[obj] = box
+
+        i0, j0, i1, j1 = self.cell_range(box)
+        if (i1 - i0 + 1) * (j1 - j0 + 1) > self.max_cells:
+            self.large.add(obj)
+            return
+
+        self.object_cells[obj] = (i0, j0, i1, j1)
+        for i in range(i0, i1 + 1):
+            for j in range(j0, j1 + 1):
+                self.cells.setdefault((i, j), set()).add(obj)
+
+    def _unplace(self, obj):
+        del self.boxes[obj]
+        if obj in self.large:
+            self.large.discard(obj)
+            return
+
+        i0, j0, i1, j1 = self.object_cells.pop(obj)
+        for i in range(i0, i1 + 1):
+            for j in range(j0, j1 + 1):
+                cell = self.cells[(i, j)]
+                cell.discard(obj)
+                if not cell:
+                    del self.cells[(i, j)]
+
+    def query_rect(self, rect):
+        """Объекты, задевающие прямоугольник (x_min, y_min, x_max, y_max), снизу вверх"""
+        rx_min, ry_min, rx_max, ry_max = rect
+        i0, j0, i1, j1 = self.cell_range(rect)
+
+        if (i1 - i0 + 1) * (j1 - j0 + 1) > len(self.cells):
+            candidates = set(self.z_order)
+        else:
+            candidates = set(self.large)
+            for i in range(i0, i1 + 1):
+                for j in range(j0, j1 + 1):
+                    candidates.update(self.cells.get((i, j), ()))
+
+        result = []
+        for obj in candidates:
+            x_min, y_min, x_max, y_max = self.boxes[obj]
+            if x_min <= rx_max and x_max >= rx_min and y_min <= ry_max and y_max >= ry_min:
+                result.append(obj)
+        result.sort(key=self.z_order.__getitem__)
+        return result
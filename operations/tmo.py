@@ -1,68 +1,96 @@
 import numpy as np
 from primitives.polygon import Polygon
-from shapely.geometry import Polygon as ShapelyPolygon
+from primitives.multi_polygon import MultiPolygon
+from operations.intersections import rings_intersect, ring_intersection_points
+from utils import lazy_import
+
+# Shapely загружается при первой булевой операции
+shapely = lazy_import("shapely")
 
 class TMOperations:
     
     @staticmethod
     def union(poly1, poly2):
-        shapely_poly1 = ShapelyPolygon(poly1.points)
-        shapely_poly2 = ShapelyPolygon(poly2.points)
-        union_result = shapely_poly1.union(shapely_poly2)
-
-        if union_result.is_empty:
-            return None
-
-        if union_result.geom_type == 'Polygon':
-            return Polygon(list(union_result.exterior.coords), poly1.color)
-        elif union_result.geom_type == 'MultiPolygon':
-            # Можно выбрать первую или объединить все
-            largest = max(union_result.geoms, key=lambda g: g.area)
-            return Polygon(list(largest.exterior.coords), poly1.color)
-
+        return TMOperations.union_all([poly1, poly2])
 
     @staticmethod
     def symmetric_difference(poly1, poly2):
         """Полноценная реализация симметрической разности двух полигонов с использованием Shapely"""
-        shapely_poly1 = ShapelyPolygon(poly1.points)
-        shapely_poly2 = ShapelyPolygon(poly2.points)
-        sym_diff_result = shapely_poly1.symmetric_difference(shapely_poly2)
+        return TMOperations.symmetric_difference_all([poly1, poly2])
 
-        if sym_diff_result.is_empty:
-            return None
+    @staticmethod
+    def union_all(objects):
+        """Объединение произвольного набора фигур одним каскадным объединением"""
+        geometry = TMOperations.union_geometry([obj.shapely_geometry() for obj in objects])
+        return TMOperations.union_shape(geometry, objects[0].color)
 
-        if sym_diff_result.geom_type == 'Polygon':
-            return Polygon(list(sym_diff_result.exterior.coords), poly1.color)
+    @staticmethod
+    def symmetric_difference_all(objects):
+        """Симметрическая разность набора фигур (точки, покрытые нечётное число раз)"""
+        geometry = TMOperations.symmetric_difference_geometry([obj.shapely_geometry() for obj in objects])
+        return TMOperations.symmetric_difference_shape(geometry, objects[0].color)
 
-        elif sym_diff_result.geom_type == 'MultiPolygon':
-            # Объединяем все части в одну (можно вернуть список, если это нужно)
-            all_points = []
-            for geom in sym_diff_result.geoms:
-                all_points.extend(list(geom.exterior.coords))
-            return Polygon(all_points, poly1.color)
+    # Вычисления над готовыми Shapely-геометриями не трогают фигуры и хранилище
+    # вершин, поэтому их можно выполнять в рабочем потоке. cancelled — флаг
+    # отмены (threading.Event), проверяется между шагами; progress(доля)
+    # вызывается после каждого шага.
+
+    @staticmethod
+    def union_geometry(geometries, cancelled=None, progress=None, chunk=64):
+        """Объединение геометрий: частичные объединения порциями по chunk, затем итоговое"""
+        if len(geometries) <= chunk:
+            return shapely.union_all(geometries)
+        parts = []
+        for start in range(0, len(geometries), chunk):
+            if cancelled is not None and cancelled.is_set():
+                return None
+            parts.append(shapely.union_all(geometries[start:start + chunk]))
+            if progress is not None:
+                progress(start / len(geometries))
+        return shapely.union_all(parts)
+
+    @staticmethod
+    def symmetric_difference_geometry(geometries, cancelled=None, progress=None):
+        """Симметрическая разность геометрий попарным сведением деревом"""
+        levels = max(len(geometries) - 1, 1).bit_length()
+        level = 0
+        # На каждом уровне вдвое меньше геометрий
+        while len(geometries) > 1:
+            if cancelled is not None and cancelled.is_set():
+                return None
+            pairs = zip(geometries[0::2], geometries[1::2])
+            reduced = [a.symmetric_difference(b) for a, b in pairs]
+            if len(geometries) % 2:
+                reduced.append(geometries[-1])
+            geometries = reduced
+            level += 1
+            if progress is not None:
+                progress(level / levels)
+        return geometries[0]
+
+    @staticmethod
+    def result_shape(geometry, color):
+        """Фигура по результату операции: простой многоугольник без дыр
+        остаётся Polygon, всё остальное (дыры, несколько частей) — MultiPolygon"""
+        if geometry is None or geometry.is_empty:
+            return None
+        if geometry.geom_type == 'Polygon' and not geometry.interiors:
+            return Polygon(geometry.exterior.coords, color)
+        result = MultiPolygon.from_shapely(geometry, color)
+        return result if len(result.points) else None
 
+    union_shape = result_shape
+    symmetric_difference_shape = result_shape
 
     @staticmethod
     def intersects(poly1, poly2):
         """Проверка пересечения двух полигонов"""
-        for i in range(len(poly1.points)):
-            for j in range(len(poly2.points)):
-                if TMOperations.lines_intersect(poly1.points[i], poly1.points[(i + 1) % len(poly1.points)],
-                                                  poly2.points[j], poly2.points[(j + 1) % len(poly2.points)]):
-                    return True
-        return False
+        return rings_intersect(poly1.points, poly2.points)
 
     @staticmethod
     def get_intersection_points(poly1, poly2):
         """Получение точек пересечения двух полигонов"""
-        intersection_points = []
-        for i in range(len(poly1.points)):
-            for j in range(len(poly2.points)):
-                intersection = TMOperations.line_intersection(poly1.points[i], poly1.points[(i + 1) % len(poly1.points)],
-                                                              poly2.points[j], poly2.points[(j + 1) % len(poly2.points)])
-                if intersection:
-                    intersection_points.append(intersection)
-        return intersection_points
+        return [tuple(p) for p in ring_intersection_points(poly1.points, poly2.points).tolist()]
 
     @staticmethod
     def lines_intersect(p1, p2, p3, p4):
@@ -105,7 +133,7 @@ class TMOperations:
                 return None  # Параллельные линии
 
             x = ((p2[0] - p1[0]) * (p4[0] * p3[1] - p4[1] * p3[0]) - (p4[0] - p3[0]) * (p2[0] * p1[1] - p2[1] * p1[0])) / denom
-            y = ((p2[1] - p1[1]) * (p4[0] * p3[1] - p4[1] * p3[0]) - (p4[0] - p3[0]) * (p2[1] * p1[0] - p2[0] * p1[1])) / denom
+            y = ((p2[1] - p1[1]) * (p4[0] * p3[1] - p4[1] * p3[0]) - (p4[1] - p3[1]) * (p2[0] * p1[1] - p2[1] * p1[0])) / denom
             return (x, y)
 
         return None  # Нет пересечения
@@ -38,6 +38,68 @@ class Transformation:
         # Обратный перенос
         return (x_scaled + cx, y_scaled + cy)
     
+    @staticmethod
+    def rotation_matrix(angle, center):
+        """Матрица 3x3 поворота вокруг центра"""
+        cx, cy = center
+        angle_rad = math.radians(angle)
+        cos_a = math.cos(angle_rad)
+        sin_a = math.sin(angle_rad)
+
+        return np.array([
+            [cos_a, -sin_a, cx - cx * cos_a + cy * sin_a],
+            [sin_a,  cos_a, cy - cx * sin_a - cy * cos_a],
+            [0,      0,     1]
+        ])
+
+    @staticmethod
+    def scale_matrix(scale, center):
+        """Матрица 3x3 масштабирования относительно центра"""
+        cx, cy = center
+        sx, sy = scale
+
+        return np.array([
+            [sx, 0,  cx - cx * sx],
+            [0,  sy, cy - cy * sy],
+            [0,  0,  1]
+        ])
+
+    @staticmethod
+    def translation_matrix(dx, dy):
+        """Матрица 3x3 переноса"""
+        return np.array([
+            [1, 0, dx],
+            [0, 1, dy],
+            [0, 0, 1]
+        ], dtype=np.float64)
+
+    @staticmethod
+    def apply_matrix(points, matrix):
+        """Применение матрицы 3x3 к массиву точек (N, 2) на месте"""
+        points[:] = points @ matrix[:2, :2].T + matrix[:2, 2]
+        return points
+
+    @staticmethod
+    def apply_to_objects(objects, matrix):
+        """Применение одной матрицы 3x3 к вершинам всех объектов за одну операцию"""
+        groups = {}
+        for obj in objects:
+            groups.setdefault(obj.store, []).append(obj)
+
+        linear = matrix[:2, :2].T
+        shift = matrix[:2, 2]
+        translation = (linear == np.eye(2)).all()
+        for store, group in groups.items():
+            # Собираем вершины всех объектов, преобразуем и раскладываем обратно
+            indices = store.indices(group)
+            if translation:
+                store.data[indices] += shift
+            else:
+                store.data[indices] = store.data[indices] @ linear + shift
+
+        for obj in objects:
+            obj.transformed(matrix)
+
     @staticmethod
     def calculate_angle(center, target):
         """Вычисление угла поворота между двумя точками"""
@@ -1,62 +1,110 @@
+import math
 import pygame
 import numpy as np
-from operations.transformations import Transformation
-
-class BezierCurve:
-    def __init__(self, points, color):
-        self.points = points
-        self.color = color
-        self.position = self.calculate_center()
-        self.selected = False
-        
-    def calculate_center(self):
-        x = sum(p[0] for p in self.points) / len(self.points)
-        y = sum(p[1] for p in self.points) / len(self.points)
-        return (x, y)
-    
-    def contains_point(self, point):
-        for p in self.points:
-            if np.linalg.norm(np.array(p) - np.array(point)) < 10:
-                return True
-        return False
-    
-    def move(self, offset):
-        dx = offset[0] - self.position[0]
-        dy = offset[1] - self.position[1]
-        self.points = [(p[0] + dx, p[1] + dy) for p in self.points]
-        self.position = offset
-    
-    def rotate(self, angle, center):
-        self.points = [Transformation.rotate_point(p, angle, center) for p in self.points]
-        self.position = self.calculate_center()
-    
-    def scale_x(self, sx, center):
-        self.points = [Transformation.scale_point(p, (sx, 1), center) for p in self.points]
-        self.position = self.calculate_center()
-    
-    def scale_xy(self, scale, center):
-        self.points = [Transformation.scale_point(p, (scale, scale), center) for p in self.points]
-        self.position = self.calculate_center()
-    
-    def draw(self, surface):
+from functools import lru_cache
+from operations.intersections import point_segment_distances
+from primitives.shape import Shape
+
+MAX_LEVEL = 8  # не более 2**8 отрезков на кривую
+
+
+@lru_cache(maxsize=None)
+def bernstein_basis(segments):
+    """Матрица базиса Бернштейна (segments + 1, 4) для равномерных значений t"""
+    t = np.linspace(0, 1, segments + 1)[:, None]
+    s = 1 - t
+    return np.hstack([s**3, 3*s**2*t, 3*s*t**2, t**3])
+
+
+def curve_bend(points):
+    """Наибольшая вторая разность контрольных точек (|B''| <= 6 * bend)"""
+    d = points[:-2] - 2 * points[1:-1] + points[2:]
+    return float(np.hypot(d[:, 0], d[:, 1]).max())
+
+
+def subdivision_level(bend, tolerance):
+    """Уровень деления (2**level отрезков), при котором ломаная отклоняется
+    от кривой не более чем на tolerance"""
+    # Для n равных отрезков отклонение не превышает max|B''| / (8 n^2)
+    segments = math.sqrt(0.75 * bend / tolerance)
+    if segments <= 1:
+        return 0
+    return min(math.ceil(math.log2(segments)), MAX_LEVEL)
+
+
+class BezierCurve(Shape):
+    flatness = 0.25  # допустимое отклонение ломаной от кривой, пиксели
+    hit_tolerance = 10  # расстояние до кривой, на котором она считается задетой, пиксели
+    _polylines = None
+    _bend = None
+
+    def geometry_changed(self):
+        super().geometry_changed()
+        self._polylines = None
+        self._bend = None
+
+    def translated(self, dx, dy):
+        # Ломаная — линейная комбинация контрольных точек с суммой весов 1,
+        # поэтому переносится вместе с ними; кривизна не меняется
+        super().translated(dx, dy)
+        if self._polylines is not None:
+            self._polylines = {level: polyline + (dx, dy) for level, polyline in self._polylines.items()}
+
+    def polyline(self, tolerance=None):
+        """Ломаная, аппроксимирующая кривую с отклонением не более tolerance
+        (в мировых единицах); каждый уровень деления кэшируется до изменения
+        контрольных точек"""
+        if self._bend is None:
+            self._bend = curve_bend(self.points)
+            self._polylines = {}
+        level = subdivision_level(self._bend, tolerance or self.flatness)
+        polyline = self._polylines.get(level)
+        if polyline is None:
+            polyline = self._polylines[level] = bernstein_basis(2 ** level) @ self.points
+        return polyline
+
+    def snap_points(self):
+        """Точки привязки кривой — её контрольные точки"""
+        return self.points
+
+    def contains_point(self, point, tolerance=None):
+        """Точка не дальше tolerance (мировые единицы; по умолчанию
+        hit_tolerance) от кривой или от контрольных точек, пока кривая не
+        достроена"""
+        x, y = point
+        tolerance = tolerance or self.hit_tolerance
+        # Кривая лежит внутри выпуклой оболочки контрольных точек
+        x_min, y_min, x_max, y_max = self.bounding_box()
+        if not (x_min - tolerance <= x <= x_max + tolerance and
+                y_min - tolerance <= y <= y_max + tolerance):
+            return False
+
+        if len(self.points) != 4:
+            offsets = self.points - (x, y)
+            return bool((np.hypot(offsets[:, 0], offsets[:, 1]) < tolerance).any())
+
+        # Ломаная той же точности относительно допуска, что и при отрисовке
+        # (flatness / zoom), поэтому берётся уже посчитанный уровень
+        curve = self.polyline(self.flatness * tolerance / self.hit_tolerance)
+        starts, ends = curve[:-1], curve[1:]
+        # Расстояния считаются только до отрезков, чей прямоугольник рядом с точкой
+        near = ((np.minimum(starts[:, 0], ends[:, 0]) - tolerance <= x) &
+                (np.maximum(starts[:, 0], ends[:, 0]) + tolerance >= x) &
+                (np.minimum(starts[:, 1], ends[:, 1]) - tolerance <= y) &
+                (np.maximum(starts[:, 1], ends[:, 1]) + tolerance >= y))
+        if not near.any():
+            return False
+        return bool((point_segment_distances(point, starts[near], ends[near]) < tolerance).any())
+
+    def draw(self, surface, camera=None):
         # Рисование контрольных точек
-        for point in self.points:
+        for point in self.screen_points(camera):
             pygame.draw.circle(surface, (100, 100, 100), point, 4)
-        
-        # Рисование кривой
+
+        # Рисование кривой (точность задаётся в пикселях экрана)
         if len(self.points) == 4:
-            t = np.linspace(0, 1, 100)
-            curve_points = []
-            for ti in t:
-                x = (1-ti)**3 * self.points[0][0] + 3*(1-ti)**2*ti*self.points[1][0] + \
-                     3*(1-ti)*ti**2*self.points[2][0] + ti**3*self.points[3][0]
-                y = (1-ti)**3 * self.points[0][1] + 3*(1-ti)**2*ti*self.points[1][1] + \
-                     3*(1-ti)*ti**2*self.points[2][1] + ti**3*self.points[3][1]
-                curve_points.append((x, y))
-            
-            if len(curve_points) > 1:
-                pygame.draw.lines(surface, self.color, False, curve_points, 2)
-    
-    def draw_selection(self, surface):
-        for point in self.points:
-            pygame.draw.circle(surface, (255, 0, 0), point, 6, 2)
\ No newline at end of file
+            if camera is None:
+                curve = self.polyline()
+            else:
+                curve = camera.world_to_screen(self.polyline(self.flatness / camera.zoom))
+            pygame.draw.lines(surface, self.color, False, curve, 2)
@@ -0,0 +1,117 @@
+import math
+import numpy as np
+import pygame
+from operations.intersections import points_in_polygon
+from operations.simplify import simplify_ring
+from primitives.scanline import fill_polygon, ring_successors
+from primitives.shape import Shape
+
+
+class MultiPolygon(Shape):
+    """Многоугольник из нескольких частей с дырами.
+
+    Все контуры лежат подряд в одном массиве вершин (без повтора первой
+    точки); контур i — вершины ring_offsets[i]:ring_offsets[i + 1], часть j —
+    контуры part_offsets[j]:part_offsets[j + 1], первый из них внешний.
+    Заливка по правилу чёт-нечет, поэтому дыры и части рисуются за один проход.
+    """
+
+    _lod_rings = None
+
+    def __init__(self, points, color, ring_offsets, part_offsets):
+        self.set_rings(ring_offsets, part_offsets)
+        super().__init__(points, color)
+
+    @classmethod
+    def from_store(cls, store, offset, length, color, position=None, bbox=None,
+                   ring_offsets=(0,), part_offsets=(0,)):
+        obj = super().from_store(store, offset, length, color, position, bbox)
+        obj.set_rings(ring_offsets, part_offsets)
+        return obj
+
+    @classmethod
+    def from_shapely(cls, geometry, color):
+        """Фигура по Polygon/MultiPolygon Shapely: координаты берутся массивом, без поточечного разбора"""
+        import shapely
+
+        if geometry.geom_type != 'MultiPolygon':
+            polygons = [part for part in shapely.get_parts(geometry) if part.geom_type == 'Polygon']
+            geometry = shapely.MultiPolygon(polygons)
+        _, coords, (ring_offsets, part_offsets, _) = shapely.to_ragged_array([geometry])
+
+        # Убираем замыкающую точку каждого контура
+        keep = np.ones(len(coords), dtype=bool)
+        keep[ring_offsets[1:] - 1] = False
+        ring_offsets = ring_offsets - np.arange(len(ring_offsets))
+        return cls(coords[keep], color, ring_offsets, part_offsets)
+
+    def set_rings(self, ring_offsets, part_offsets):
+        self.ring_offsets = np.asarray(ring_offsets, dtype=np.int64)
+        self.part_offsets = np.asarray(part_offsets, dtype=np.int64)
+        self.successors = ring_successors(self.ring_offsets)
+
+    def geometry_changed(self):
+        super().geometry_changed()
+        self._lod_rings = None
+
+    def translated(self, dx, dy):
+        super().translated(dx, dy)
+        if self._lod_rings is not None:
+            self._lod_rings = {level: (points + (dx, dy), ring_offsets)
+                               for level, (points, ring_offsets) in self._lod_rings.items()}
+
+    def rings(self):
+        """Вершины каждого контура (представления общего массива)"""
+        points = self.points
+        offsets = self.ring_offsets.tolist()
+        return [points[start:end] for start, end in zip(offsets[:-1], offsets[1:])]
+
+    def snap_points(self):
+        """Вершины и середины рёбер всех контуров"""
+        points = self.points
+        return np.vstack([points, (points + points[self.successors]) / 2])
+
+    def shapely_geometry(self):
+        """Shapely-мультиполигон по контурам (кэшируется до изменения вершин)"""
+        if self._geometry is None:
+            import shapely
+
+            # Возвращаем замыкающие точки перед началом каждого следующего контура
+            starts = self.ring_offsets[:-1]
+            coords = np.insert(self.points, self.ring_offsets[1:], self.points[starts], axis=0)
+            ring_offsets = self.ring_offsets + np.arange(len(self.ring_offsets))
+            geometry_offsets = np.array([0, len(self.part_offsets) - 1])
+            self._geometry = shapely.from_ragged_array(
+                shapely.GeometryType.MULTIPOLYGON, coords,
+                (ring_offsets, self.part_offsets, geometry_offsets))[0]
+        return self._geometry
+
+    def contains_point(self, point):
+        """Правило чёт-нечет сразу по всем рёбрам всех контуров"""
+        return bool(points_in_polygon([point], self.points, self.successors)[0])
+
+    def intersects(self, other):
+        return self.shapely_geometry().intersects(other.shapely_geometry())
+
+    def lod_rings(self, camera=None):
+        """Вершины и смещения контуров для отрисовки; при отдалении каждый
+        контур упрощается (уровни кэшируются, как в Shape.lod_points)"""
+        if camera is None or len(self.points) < self.lod_min_vertices:
+            return self.screen_points(camera), self.ring_offsets
+        level = math.floor(math.log2(self.lod_tolerance / camera.zoom))
+        if self._lod_rings is None:
+            self._lod_rings = {}
+        lod = self._lod_rings.get(level)
+        if lod is None:
+            rings = [simplify_ring(ring, 2.0 ** level) for ring in self.rings()]
+            sizes = [len(ring) for ring in rings]
+            lod = self._lod_rings[level] = (np.vstack(rings), np.concatenate([[0], np.cumsum(sizes)]))
+        points, ring_offsets = lod
+        return camera.world_to_screen(points), ring_offsets
+
+    def draw(self, surface, camera=None):
+        points, ring_offsets = self.lod_rings(camera)
+        fill_polygon(surface, self.color, points, ring_offsets)
+        offsets = ring_offsets.tolist()
+        for start, end in zip(offsets[:-1], offsets[1:]):
+            pygame.draw.polygon(surface, (0, 0, 0), points[start:end], 1)
@@ -2,10 +2,14 @@ import pygame
 import math 
 import numpy as np 
 from typing import List, Tuple, Union 
+from operations.intersections import points_in_polygon
+from operations.transformations import Transformation
+from primitives.vertex_store import StoredVertices
+from primitives.scanline import fill_polygon
  
-class Primitives: 
+class Primitives(StoredVertices): 
     def __init__(self, color: Tuple[int, int, int], line_width: int = 1): 
-        self.points: List[Tuple[float, float]] = [] 
+        self.points = [] 
         self.color = color 
         self.selected = False 
         self.line_width = line_width 
@@ -14,11 +18,10 @@ class Primitives:
  
     def update_center(self): 
         """Вычисление центра фигуры как среднего арифметического вершин""" 
-        if not self.points: 
+        if not len(self.points): 
             return (0, 0) 
          
-        sum_x = sum(p[0] for p in self.points) 
-        sum_y = sum(p[1] for p in self.points) 
+        sum_x, sum_y = self.points.sum(axis=0)
         self.center = (sum_x / len(self.points), sum_y / len(self.points)) 
         return self.center 
 
@@ -26,26 +29,7 @@ class Primitives:
  
     def contains_point(self, point: Tuple[float, float]) -> bool: 
         """Проверка, находится ли точка внутри полигона (алгоритм ray casting)""" 
-        if len(self.points) < 3: 
-            return False 
-             
-        x, y = point 
-        n = len(self.points) 
-        inside = False 
-        p1x, p1y = self.points[0] 
-         
-        for i in range(n + 1): 
-            p2x, p2y = self.points[i % n] 
-            if y > min(p1y, p2y): 
-                if y <= max(p1y, p2y): 
-                    if x <= max(p1x, p2x): 
-                        if p1y != p2y: 
-                            xinters = (y - p1y) * (p2x - p1x) / (p2y - p1y) + p1x 
-                        if p1x == p2x or x <= xinters: 
-                            inside = not inside 
-            p1x, p1y = p2x, p2y 
-             
-        return inside 
+        return bool(points_in_polygon([point], self.points)[0])
  
     def matrix_multiply(self, matrix: np.ndarray, vector: np.ndarray) -> np.ndarray: 
         """Умножение матрицы на вектор""" 
@@ -53,8 +37,10 @@ class Primitives:
  
     def move(self, dx: float, dy: float): 
         """Плоскопараллельное перемещение""" 
-        self.points = [(x + dx, y + dy) for x, y in self.points] 
+        points = self.points
+        points += (dx, dy)
         self.update_center() 
+        self.geometry_changed()
  
     def rotate(self, angle: float, center: Tuple[float, float] = None): 
         """Поворот вокруг центра фигуры или заданной точки""" 
@@ -89,17 +75,10 @@ class Primitives:
  
         transform_matrix = translate_back @ rotation_matrix @ translate_to_origin 
          
-        # Применение преобразования к точкам 
-        new_points = [] 
-        for point in self.points: 
-            # Конвертация в однородные координаты 
-            vector = np.array([point[0], point[1], 1]) 
-            # Умножение на матрицу преобразования 
-            transformed = self.matrix_multiply(transform_matrix, vector) 
-            new_points.append((transformed[0], transformed[1])) 
-         
-        self.points = new_points 
+        # Применение преобразования сразу ко всем точкам (на месте) 
+        Transformation.apply_matrix(self.points, transform_matrix)
         self.update_center() 
+        self.geometry_changed()
  
     def scale(self, sx: float, sy: float, center: Tuple[float, float] = None): 
         """Масштабирование относительно центра или заданной точки""" 
@@ -129,15 +108,10 @@ class Primitives:
         # Комбинированная матрица преобразования 
         transform_matrix = translate_back @ scale_matrix @ translate_to_origin 
          
-        # Применение преобразования к точкам 
-        new_points = [] 
-        for point in self.points: 
-            vector = np.array([point[0], point[1], 1]) 
-            transformed = self.matrix_multiply(transform_matrix, vector) 
-            new_points.append((transformed[0], transformed[1])) 
-         
-        self.points = new_points 
+        # Применение преобразования сразу ко всем точкам (на месте) 
+        Transformation.apply_matrix(self.points, transform_matrix)
         self.update_center() 
+        self.geometry_changed()
  
     def reflect(self, line_points: List[Tuple[float, float]]): 
         """Зеркальное отражение относительно прямой общего положения""" 
@@ -167,38 +141,11 @@ class Primitives:
         self.move(line_center[0], line_center[1]) 
  
     def draw(self, surface: pygame.Surface): 
-        """Отрисовка примитива с заливкой (алгоритм сканирующих строк)""" 
+        """Отрисовка примитива с заливкой (сканирующие строки с таблицей активных рёбер)""" 
         if len(self.points) < 3: 
             return 
-             
-        # Поиск min и max Y 
-        y_min = min(p[1] for p in self.points) 
-        y_max = max(p[1] for p in self.points) 
-         
-        # Отрисовка по сканирующим строкам 
-        for y in range(int(y_min), int(y_max) + 1): 
-            intersections = [] 
-             
-            # Поиск пересечений с ребрами 
-            for i in range(len(self.points)): 
-                p1 = self.points[i] 
-                p2 = self.points[(i + 1) % len(self.points)] 
-                 
-                if (p1[1] < y and p2[1] >= y) or (p2[1] < y and p1[1] >= y): 
-                    if p1[1] != p2[1]: 
-                        x = p1[0] + (y - p1[1]) * (p2[0] - p1[0]) / (p2[1] - 
-p1[1]) 
-                        intersections.append(x) 
-             
-            intersections.sort() 
-             
-            # Отрисовка горизонтальных линий между точками пересечения 
-            for i in range(0, len(intersections), 2): 
-                if i + 1 < len(intersections): 
-                    start_x = int(intersections[i]) 
-                    end_x = int(intersections[i + 1]) 
-                    pygame.draw.line(surface, self.color, (start_x, y), (end_x, 
-y), self.line_width) 
+ 
+        fill_polygon(surface, self.color, self.points)
  
     def draw_outline(self, surface: pygame.Surface): 
         """Отрисовка контура примитива""" 
@@ -0,0 +1,101 @@
+import numpy as np
+import pygame
+
+
+def ring_successors(ring_offsets):
+    """Номер следующей вершины для каждой вершины набора замкнутых контуров.
+
+    Контур i занимает вершины ring_offsets[i]:ring_offsets[i + 1];
+    за последней вершиной контура следует его первая вершина.
+    """
+    ring_offsets = np.asarray(ring_offsets, dtype=np.int64)
+    successors = np.arange(1, ring_offsets[-1] + 1)
+    successors[ring_offsets[1:] - 1] = ring_offsets[:-1]
+    return successors
+
+
+def build_edge_table(points, ring_offsets=None):
+    """Таблица рёбер, отсортированная по первой сканирующей строке.
+
+    Для каждого негоризонтального ребра хранится первая и последняя
+    строка (y_low < y <= y_high), x на первой строке и приращение x на строку.
+    Без ring_offsets точки образуют один замкнутый контур.
+    """
+    points = np.asarray(points, dtype=np.float64).reshape(-1, 2)
+    x1, y1 = points[:, 0], points[:, 1]
+    if ring_offsets is None:
+        x2, y2 = np.roll(x1, -1), np.roll(y1, -1)
+    else:
+        successors = ring_successors(ring_offsets)
+        x2, y2 = x1[successors], y1[successors]
+
+    swap = y1 > y2
+    x_low = np.where(swap, x2, x1)
+    y_low = np.where(swap, y2, y1)
+    x_high = np.where(swap, x1, x2)
+    y_high = np.where(swap, y1, y2)
+
+    first = np.floor(y_low).astype(np.int64) + 1
+    last = np.floor(y_high).astype(np.int64)
+    keep = (y_low != y_high) & (first <= last)
+
+    x_low, y_low, x_high, y_high = x_low[keep], y_low[keep], x_high[keep], y_high[keep]
+    first, last = first[keep], last[keep]
+    slope = (x_high - x_low) / (y_high - y_low)
+    x_first = x_low + (first - y_low) * slope
+
+    order = np.argsort(first, kind="stable")
+    return first[order], last[order], x_first[order], slope[order]
+
+
+def fill_polygon(surface, color, points, ring_offsets=None):
+    """Заливка многоугольника по правилу чёт-нечет (таблица и список активных рёбер).
+
+    Отрезки строк записываются сразу в пиксели поверхности через
+    pygame.surfarray с учётом её области отсечения. С ring_offsets все
+    контуры (части и дыры) заливаются за один проход.
+    """
+    first, last, x_first, slope = build_edge_table(points, ring_offsets)
+    if not len(first):
+        return
+
+    clip = surface.get_clip()
+    y_begin = max(int(first[0]), clip.top)
+    y_end = min(int(last.max()), clip.bottom - 1)
+    if y_begin > y_end or clip.width <= 0:
+        return
+
+    left, right = clip.left, clip.right - 1
+    mapped = surface.map_rgb(color)
+    if surface.get_bytesize() == 3:
+        pixels = None  # pixels2d не поддерживает 24-битные поверхности
+    else:
+        pixels = pygame.surfarray.pixels2d(surface)
+
+    first, last = first.tolist(), last.tolist()
+    x_first, slope = x_first.tolist(), slope.tolist()
+    active = []
+    k = 0
+    for y in range(y_begin, y_end + 1):
+        # Новые рёбра из таблицы (x пересчитывается, если ребро началось выше отсечения)
+        while k < len(first) and first[k] <= y:
+            if last[k] >= y:
+                active.append([x_first[k] + (y - first[k]) * slope[k], slope[k], last[k]])
+            k += 1
+        active = [edge for edge in active if edge[2] >= y]
+        active.sort()
+
+        for i in range(0, len(active) - 1, 2):
+            start_x = max(int(active[i][0]), left)
+            end_x = min(int(active[i + 1][0]), right)
+            if start_x > end_x:
+                continue
+            if pixels is None:
+                surface.fill(color, (start_x, y, end_x - start_x + 1, 1))
+            else:
+                pixels[start_x:end_x + 1, y] = mapped
+
+        for edge in active:
+            edge[0] += edge[1]
+
+    del pixels  # снимаем блокировку поверхности
@@ -0,0 +1,178 @@
+import math
+import numpy as np
+import pygame
+from operations.simplify import simplify_ring
+from operations.transformations import Transformation
+from primitives.vertex_store import StoredVertices
+
+
+class Shape(StoredVertices):
+    """Базовый класс фигур редактора.
+
+    Сама фигура хранит только цвет и ссылку на участок общего буфера
+    вершин, все преобразования выполняются на месте над этим участком.
+    """
+
+    damage_padding = 8  # кружки выделения радиусом 6 и толщиной 2
+    lod_tolerance = 0.5  # допустимое отклонение упрощённого контура, пиксели
+    lod_min_vertices = 64  # контуры меньше этого не упрощаются
+    _geometry = None
+    _bbox = None
+    _lod = None
+
+    def __init__(self, points, color):
+        self.points = points
+        self.color = color
+        self.selected = False
+
+    @classmethod
+    def from_store(cls, store, offset, length, color, position=None, bbox=None):
+        """Фигура поверх вершин, уже лежащих в хранилище (без копирования)"""
+        obj = cls.__new__(cls)
+        store.attach(obj, offset, length)
+        obj.color = color
+        obj.position = position or obj.calculate_center()
+        obj._bbox = bbox
+        obj.selected = False
+        return obj
+
+    @property
+    def points(self):
+        return self.store.view(self)
+
+    @points.setter
+    def points(self, points):
+        # Новый набор вершин: центр и прямоугольник считаются заново
+        self.store.assign(self, points)
+        self.position = self.calculate_center()
+        self._bbox = None
+        self.geometry_changed()
+
+    def calculate_center(self):
+        x, y = self.points.mean(axis=0)
+        return (float(x), float(y))
+
+    def geometry_changed(self):
+        self._geometry = None
+        self._lod = None
+
+    def translated(self, dx, dy):
+        """Обновление кэшей после переноса вершин на (dx, dy).
+
+        Упрощение контура от положения не зависит, поэтому готовые уровни
+        детализации сдвигаются, а не считаются заново (при перетаскивании
+        это происходит на каждом движении мыши).
+        """
+        self._geometry = None
+        if self._lod is not None:
+            self._lod = {level: points + (dx, dy) for level, points in self._lod.items()}
+
+    def shapely_geometry(self):
+        """Shapely-многоугольник по вершинам (кэшируется до изменения вершин)"""
+        if self._geometry is None:
+            from shapely.geometry import Polygon as ShapelyPolygon
+            self._geometry = ShapelyPolygon(self.points)
+        return self._geometry
+
+    def bounding_box(self):
+        """Ограничивающий прямоугольник (x_min, y_min, x_max, y_max), кэшируется"""
+        if self._bbox is None:
+            points = self.points
+            x_min, y_min = points.min(axis=0)
+            x_max, y_max = points.max(axis=0)
+            self._bbox = (float(x_min), float(y_min), float(x_max), float(y_max))
+        return self._bbox
+
+    def damage_rect(self, camera=None):
+        """Область экрана, которую занимает фигура вместе с контуром и выделением"""
+        if camera is not None:
+            return camera.box_to_screen(self.bounding_box(), self.damage_padding)
+        x_min, y_min, x_max, y_max = self.bounding_box()
+        pad = self.damage_padding
+        return pygame.Rect(int(x_min) - pad, int(y_min) - pad,
+                           int(x_max - x_min) + 2 * pad + 2, int(y_max - y_min) + 2 * pad + 2)
+
+    def screen_points(self, camera=None):
+        """Вершины в экранных координатах"""
+        if camera is None:
+            return self.points
+        return camera.world_to_screen(self.points)
+
+    def snap_points(self):
+        """Точки привязки: вершины и середины рёбер замкнутого контура"""
+        points = self.points
+        following = np.concatenate([points[1:], points[:1]])
+        return np.concatenate([points, (points + following) / 2])
+
+    def lod_points(self, camera=None):
+        """Вершины для отрисовки: при отдалении контур упрощается.
+
+        Мировой допуск округляется вниз до степени двойки, поэтому каждый
+        уровень детализации считается один раз и хранится до изменения
+        вершин.
+        """
+        if camera is None or len(self.points) < self.lod_min_vertices:
+            return self.screen_points(camera)
+        level = math.floor(math.log2(self.lod_tolerance / camera.zoom))
+        if self._lod is None:
+            self._lod = {}
+        points = self._lod.get(level)
+        if points is None:
+            points = self._lod[level] = simplify_ring(self.points, 2.0 ** level)
+        return camera.world_to_screen(points)
+
+    def translate(self, dx, dy):
+        """Перенос на (dx, dy)"""
+        points = self.points
+        points += (dx, dy)
+        self.position = (self.position[0] + dx, self.position[1] + dy)
+        if self._bbox is not None:
+            x_min, y_min, x_max, y_max = self._bbox
+            self._bbox = (x_min + dx, y_min + dy, x_max + dx, y_max + dy)
+        self.translated(dx, dy)
+
+    def transform(self, matrix):
+        """Применение аффинной матрицы 3x3"""
+        Transformation.apply_matrix(self.points, matrix)
+        self.transformed(matrix)
+
+    def transformed(self, matrix):
+        """Обновление производных данных после применения матрицы к вершинам.
+
+        Центр (среднее вершин) переходит в образ центра, поэтому вершины не
+        пересчитываются. Прямоугольник пересчитывается по углам, только если
+        матрица не поворачивает и не скашивает; иначе он будет найден заново
+        при следующем обращении. Чистый перенос сохраняет кэши (translated).
+        """
+        (a, b, tx), (c, d, ty), _ = matrix.tolist()
+        x, y = self.position
+        self.position = (a * x + b * y + tx, c * x + d * y + ty)
+
+        if self._bbox is not None and b == 0 and c == 0:
+            x_min, y_min, x_max, y_max = self._bbox
+            x1, x2 = a * x_min + tx, a * x_max + tx
+            y1, y2 = d * y_min + ty, d * y_max + ty
+            self._bbox = (min(x1, x2), min(y1, y2), max(x1, x2), max(y1, y2))
+        else:
+            self._bbox = None
+
+        if a == d == 1 and b == c == 0:
+            self.translated(tx, ty)
+        else:
+            self.geometry_changed()
+
+    def move(self, offset):
+        self.translate(offset[0] - self.position[0], offset[1] - self.position[1])
+
+    def rotate(self, angle, center):
+        self.transform(Transformation.rotation_matrix(angle, center))
+
+    def scale_x(self, sx, center):
+        self.transform(Transformation.scale_matrix((sx, 1), center))
+
+    def scale_xy(self, scale, center):
+        self.transform(Transformation.scale_matrix((scale, scale), center))
+
+    def draw_selection(self, surface, camera=None):
+        for point in self.screen_points(camera):
+            pygame.draw.circle(surface, (255, 0, 0), point, 6, 2)
@@ -0,0 +1,116 @@
+import weakref
+import numpy as np
+
+
+class VertexStore:
+    """Общий непрерывный буфер вершин сцены (float64, N x 2).
+
+    Каждый объект-владелец хранит только смещение (offset) и количество
+    вершин (length) своего участка буфера.
+    """
+
+    def __init__(self, capacity=1024):
+        self.data = np.empty((capacity, 2), dtype=np.float64)
+        self.size = 0
+        self.owners = weakref.WeakSet()
+
+    @classmethod
+    def wrap(cls, data):
+        """Хранилище поверх готового массива (например, numpy.memmap файла сцены)"""
+        store = cls.__new__(cls)
+        store.data = data
+        store.size = len(data)
+        store.owners = weakref.WeakSet()
+        return store
+
+    def attach(self, owner, offset, length):
+        """Привязывает объект к уже записанному участку буфера без копирования"""
+        owner.store = self
+        owner.offset = offset
+        owner.length = length
+        self.owners.add(owner)
+
+    def view(self, owner):
+        """Срез буфера с вершинами объекта (без копирования)"""
+        return self.data[owner.offset:owner.offset + owner.length]
+
+    def assign(self, owner, points):
+        """Записывает вершины объекта, при необходимости выделяя новый участок"""
+        points = np.asarray(points, dtype=np.float64).reshape(-1, 2)
+        n = len(points)
+
+        if owner in self.owners and owner.length == n:
+            self.data[owner.offset:owner.offset + n] = points
+            return
+
+        # Старый участок становится мусором и освобождается при уплотнении
+        self.owners.discard(owner)
+        self.reserve(n)
+        owner.offset = self.size
+        owner.length = n
+        self.data[self.size:self.size + n] = points
+        self.size += n
+        self.owners.add(owner)
+
+    def release(self, owner):
+        """Освобождает участок объекта"""
+        self.owners.discard(owner)
+        owner.length = 0
+
+    def indices(self, owners):
+        """Индексы вершин нескольких объектов в общем буфере"""
+        offsets = np.fromiter((o.offset for o in owners), dtype=np.intp)
+        lengths = np.fromiter((o.length for o in owners), dtype=np.intp)
+        # Сдвиг каждого участка относительно его места в итоговом массиве
+        shifts = np.repeat(offsets - (np.cumsum(lengths) - lengths), lengths)
+        return shifts + np.arange(lengths.sum())
+
+    def live_count(self):
+        return sum(o.length for o in self.owners)
+
+    def reserve(self, n):
+        """Гарантирует место под n вершин в конце буфера"""
+        if self.size + n <= len(self.data):
+            return
+
+        live = self.live_count()
+        capacity = len(self.data)
+        while live + n > capacity // 2:
+            capacity *= 2
+        self.compact(capacity)
+
+    def compact(self, capacity=None):
+        """Уплотнение: удаляет участки освобождённых объектов"""
+        capacity = capacity or len(self.data)
+        data = np.empty((capacity, 2), dtype=np.float64)
+        size = 0
+        for owner in sorted(self.owners, key=lambda o: o.offset):
+            n = owner.length
+            data[size:size + n] = self.data[owner.offset:owner.offset + n]
+            owner.offset = size
+            size += n
+        self.data = data
+        self.size = size
+
+
+scene_store = VertexStore()
+
+
+class StoredVertices:
+    """Примесь: вершины объекта лежат в общем буфере сцены"""
+
+    store = scene_store
+    offset = 0
+    length = 0
+
+    @property
+    def points(self):
+        return self.store.view(self)
+
+    @points.setter
+    def points(self, points):
+        self.store.assign(self, points)
+        self.geometry_changed()
+
+    def geometry_changed(self):
+        """Вызывается после любого изменения вершин; сбрасывает производные кэши"""
@@ -0,0 +1,118 @@
+import json
+import time
+from collections import defaultdict, deque
+
+
+class FrameProfiler:
+    """Замер времени фаз главного цикла редактора.
+
+    Пока профилировщик выключен, редактор вместо lap вызывает пустую
+    заглушку, поэтому замеры почти ничего не стоят.
+    """
+
+    def __init__(self, history=240):
+        self.enabled = False
+        self.frame_times = deque(maxlen=history)   # время работы кадра
+        self.intervals = deque(maxlen=history)     # период между кадрами (для FPS)
+        self.current = defaultdict(float)
+        self.recent = deque(maxlen=history)
+        self.totals = defaultdict(float)
+        self.maxima = defaultdict(float)
+        self.frame_count = 0
+        self.frame_start = None
+        self.mark = None
+
+    def toggle(self):
+        self.enabled = not self.enabled
+        self.frame_start = None
+        self.mark = time.perf_counter()
+        self.current.clear()
+
+    def begin_frame(self):
+        if not self.enabled:
+            return
+        now = time.perf_counter()
+        if self.frame_start is not None:
+            self.intervals.append(now - self.frame_start)
+        self.frame_start = self.mark = now
+
+    def lap(self, phase):
+        """Относит время, прошедшее с предыдущей отметки, к фазе"""
+        now = time.perf_counter()
+        self.current[phase] += now - self.mark
+        self.mark = now
+
+    def end_frame(self):
+        if not self.enabled:
+            return
+        if self.frame_start is None:
+            # Профилировщик включили посреди кадра: неполный кадр не учитываем
+            self.current.clear()
+            return
+        duration = time.perf_counter() - self.frame_start
+        self.frame_times.append(duration)
+        self.frame_count += 1
+
+        frame = dict(self.current)
+        frame["frame"] = duration
+        self.recent.append(frame)
+        for phase, seconds in frame.items():
+            self.totals[phase] += seconds
+            self.maxima[phase] = max(self.maxima[phase], seconds)
+        self.current.clear()
+
+    def fps(self):
+        if not self.intervals:
+            return 0.0
+        return len(self.intervals) / sum(self.intervals)
+
+    def histogram(self, bucket_ms=4, buckets=8):
+        """Число кадров по интервалам длительности; последний интервал открытый"""
+        counts = [0] * buckets
+        for seconds in self.frame_times:
+            counts[min(int(seconds * 1000 / bucket_ms), buckets - 1)] += 1
+        return counts
+
+    def summary(self):
+        phases = {}
+        for phase, total in self.totals.items():
+            phases[phase] = {
+                "total_ms": total * 1000,
+                "mean_ms": total * 1000 / self.frame_count,
+                "max_ms": self.maxima[phase] * 1000,
+            }
+        return {
+            "frames": self.frame_count,
+            "phases": phases,
+            "recent_frames_ms": [
+                {phase: seconds * 1000 for phase, seconds in frame.items()}
+                for frame in self.recent
+            ],
+        }
+
+    def dump(self, path):
+        """Сохраняет накопленные замеры в JSON (если профилировщик включался)"""
+        if not self.frame_count:
+            return
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.summary(), f, indent=2, ensure_ascii=False)
+
+
+class StartupTimer:
+    """Время запуска по этапам: от старта main.py до первого кадра"""
+
+    def __init__(self, start=None):
+        self.start = time.perf_counter() if start is None else start
+        self.last = self.start
+        self.phases = []
+
+    def mark(self, phase):
+        """Относит время, прошедшее с предыдущей отметки, к этапу"""
+        now = time.perf_counter()
+        self.phases.append((phase, now - self.last))
+        self.last = now
+
+    def report(self):
+        lines = [f"{phase:<16}{seconds * 1000:8.1f} мс" for phase, seconds in self.phases]
+        lines.append(f"{'до первого кадра':<16}{(self.last - self.start) * 1000:8.1f} мс")
+        return "\n".join(lines)
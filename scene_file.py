@@ -0,0 +1,179 @@
+"""Двоичный формат сцены.
+
+Файл состоит из заголовка, таблицы объектов, непрерывного блока
+вершин float64 (N, 2) и блока смещений контуров int64 для многоугольников
+из нескольких контуров (начиная с версии 2). Таблица и вершины
+открываются через numpy.memmap, поэтому открытие не читает вершины:
+страницы подгружаются при первом обращении к конкретному объекту.
+"""
+import os
+import tempfile
+
+import numpy as np
+from primitives.bezier import BezierCurve
+from primitives.multi_polygon import MultiPolygon
+from primitives.polygon import Polygon
+from primitives.right_triangle import RightTriangle
+from primitives.vertex_store import VertexStore
+
+MAGIC = b"GSKSCENE"
+VERSION = 2
+
+HEADER_DTYPE = np.dtype([
+    ("magic", "S8"),
+    ("version", "<u4"),
+    ("index_count", "<u4"),  # длина блока смещений контуров (в версии 1 всегда 0)
+    ("object_count", "<u8"),
+    ("vertex_count", "<u8"),
+])
+
+OBJECT_DTYPE_V1 = np.dtype([
+    ("type", "u1"),
+    ("color", "u1", 3),
+    ("offset", "<u8"),
+    ("count", "<u8"),
+    ("bbox", "<f8", 4),      # x_min, y_min, x_max, y_max
+    ("center", "<f8", 2),
+])
+
+OBJECT_DTYPE = np.dtype(OBJECT_DTYPE_V1.descr + [
+    ("rings", "<u8"),        # начало смещений контуров в блоке смещений
+    ("ring_count", "<u4"),
+    ("part_count", "<u4"),
+])
+
+OBJECT_DTYPES = {1: OBJECT_DTYPE_V1, 2: OBJECT_DTYPE}
+
+OBJECT_TYPES = {
+    1: Polygon,
+    2: RightTriangle,
+    3: BezierCurve,
+    4: MultiPolygon,
+}
+TYPE_CODES = {cls: code for code, cls in OBJECT_TYPES.items()}
+
+
+def vertex_block_offset(object_count, object_dtype=OBJECT_DTYPE):
+    """Смещение блока вершин (выровнено по 16 байт)"""
+    end = HEADER_DTYPE.itemsize + object_dtype.itemsize * object_count
+    return (end + 15) // 16 * 16
+
+
+def save_scene(path, objects):
+    """Сохраняет объекты сцены в файл"""
+    counts = np.array([len(obj.points) for obj in objects], dtype=np.uint64)
+    table = np.zeros(len(objects), dtype=OBJECT_DTYPE)
+    table["type"] = [TYPE_CODES[type(obj)] for obj in objects]
+    table["color"] = [obj.color for obj in objects] or np.empty((0, 3))
+    table["count"] = counts
+    table["offset"] = np.cumsum(counts) - counts
+    table["bbox"] = [obj.bounding_box() for obj in objects] or np.empty((0, 4))
+    table["center"] = [obj.position for obj in objects] or np.empty((0, 2))
+    offset = int(counts.sum())
+
+    # Смещения контуров и частей многоугольников из нескольких контуров
+    index = []
+    index_count = 0
+    for row, obj in zip(table, objects):
+        if isinstance(obj, MultiPolygon):
+            row["rings"] = index_count
+            row["ring_count"] = len(obj.ring_offsets) - 1
+            row["part_count"] = len(obj.part_offsets) - 1
+            index += [obj.ring_offsets, obj.part_offsets]
+            index_count += len(obj.ring_offsets) + len(obj.part_offsets)
+
+    header = np.zeros(1, dtype=HEADER_DTYPE)
+    header["magic"] = MAGIC
+    header["version"] = VERSION
+    header["index_count"] = index_count
+    header["object_count"] = len(objects)
+    header["vertex_count"] = offset
+
+    # Объекты загруженной сцены читают вершины через memmap этого же файла,
+    # поэтому он не перезаписывается на месте: новый файл пишется рядом и
+    # подменяет старый, а старый остаётся доступен через отображение
+    fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(path)), suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(header.tobytes())
+            f.write(table.tobytes())
+            f.write(b"\0" * (vertex_block_offset(len(objects)) - f.tell()))
+            # Вершины пишутся подряд в порядке таблицы
+            for obj in objects:
+                f.write(np.ascontiguousarray(obj.points, dtype="<f8").tobytes())
+            for offsets in index:
+                f.write(np.asarray(offsets, dtype="<i8").tobytes())
+        # mkstemp создаёт файл с правами 0600; даём обычные права с учётом umask
+        umask = os.umask(0)
+        os.umask(umask)
+        os.chmod(temp_path, 0o666 & ~umask)
+        os.replace(temp_path, path)
+    except BaseException:
+        os.unlink(temp_path)
+        raise
+
+
+class SceneFile:
+    """Открытый файл сцены: таблица объектов и вершины через memmap.
+
+    Объекты создаются только при обращении к ним и ссылаются прямо на
+    вершины файла (копирование при записи: изменения остаются в памяти).
+    """
+
+    def __init__(self, path):
+        header = np.fromfile(path, dtype=HEADER_DTYPE, count=1)
+        if not len(header) or header["magic"][0] != MAGIC:
+            raise ValueError(f"{path}: не файл сцены")
+        object_dtype = OBJECT_DTYPES.get(int(header["version"][0]))
+        if object_dtype is None:
+            raise ValueError(f"{path}: неподдерживаемая версия {header['version'][0]}")
+
+        self.path = path
+        count = int(header["object_count"][0])
+        vertex_count = int(header["vertex_count"][0])
+        index_count = int(header["index_count"][0])
+        vertex_offset = vertex_block_offset(count, object_dtype)
+        if count:
+            self.table = np.memmap(path, dtype=object_dtype, mode="r",
+                                   offset=HEADER_DTYPE.itemsize, shape=(count,))
+        else:
+            self.table = np.zeros(0, dtype=object_dtype)
+        if vertex_count:
+            vertices = np.memmap(path, dtype="<f8", mode="c",
+                                 offset=vertex_offset, shape=(vertex_count, 2))
+        else:
+            vertices = np.empty((0, 2), dtype=np.float64)
+        if index_count:
+            self.ring_index = np.memmap(path, dtype="<i8", mode="r",
+                                   offset=vertex_offset + vertices.nbytes, shape=(index_count,))
+        else:
+            self.ring_index = np.empty(0, dtype=np.int64)
+        self.store = VertexStore.wrap(vertices)
+        self.cache = {}
+
+    def __len__(self):
+        return len(self.table)
+
+    def __getitem__(self, index):
+        """Объект с номером index (создаётся при первом обращении)"""
+        obj = self.cache.get(index)
+        if obj is None:
+            row = self.table[index]
+            cls = OBJECT_TYPES[int(row["type"])]
+            args = (self.store, int(row["offset"]), int(row["count"]),
+                    tuple(int(c) for c in row["color"]),
+                    tuple(float(c) for c in row["center"]),
+                    tuple(float(v) for v in row["bbox"]))
+            if cls is MultiPolygon:
+                start = int(row["rings"])
+                middle = start + int(row["ring_count"]) + 1
+                end = middle + int(row["part_count"]) + 1
+                obj = cls.from_store(*args, ring_offsets=self.ring_index[start:middle],
+                                     part_offsets=self.ring_index[middle:end])
+            else:
+                obj = cls.from_store(*args)
+            self.cache[index] = obj
+        return obj
+
+    def __iter__(self):
+        return (self[i] for i in range(len(self)))
@@ -0,0 +1,57 @@
+import math
+import numpy as np
+import pygame
+
+
+class Camera:
+    """Камера холста: экранная точка = (мировая точка - (x, y)) * zoom"""
+
+    min_zoom = 0.01
+    max_zoom = 100.0
+
+    def __init__(self, x=0.0, y=0.0, zoom=1.0):
+        self.x = x
+        self.y = y
+        self.zoom = zoom
+
+    @property
+    def is_identity(self):
+        return self.x == 0 and self.y == 0 and self.zoom == 1
+
+    def world_to_screen(self, points):
+        """Перевод массива мировых точек (N, 2) в экранные одной операцией"""
+        if self.is_identity:
+            return points
+        return (np.asarray(points, dtype=np.float64) - (self.x, self.y)) * self.zoom
+
+    def point_to_screen(self, point):
+        return ((point[0] - self.x) * self.zoom, (point[1] - self.y) * self.zoom)
+
+    def screen_to_world(self, pos):
+        return (pos[0] / self.zoom + self.x, pos[1] / self.zoom + self.y)
+
+    def box_to_screen(self, box, padding=0):
+        """Экранный прямоугольник для мирового (x_min, y_min, x_max, y_max) с отступом в пикселях"""
+        x_min, y_min, x_max, y_max = box
+        left = math.floor((x_min - self.x) * self.zoom) - padding
+        top = math.floor((y_min - self.y) * self.zoom) - padding
+        right = math.ceil((x_max - self.x) * self.zoom) + padding
+        bottom = math.ceil((y_max - self.y) * self.zoom) + padding
+        return pygame.Rect(left, top, right - left + 2, bottom - top + 2)
+
+    def rect_to_world(self, rect):
+        """Мировой прямоугольник, видимый в экранной области rect"""
+        return (rect.left / self.zoom + self.x, rect.top / self.zoom + self.y,
+                rect.right / self.zoom + self.x, rect.bottom / self.zoom + self.y)
+
+    def pan(self, dx, dy):
+        """Сдвиг вида на (dx, dy) экранных пикселей"""
+        self.x -= dx / self.zoom
+        self.y -= dy / self.zoom
+
+    def zoom_at(self, factor, pos):
+        """Масштабирование вида так, что точка под курсором остаётся на месте"""
+        world_x, world_y = self.screen_to_world(pos)
+        self.zoom = min(max(self.zoom * factor, self.min_zoom), self.max_zoom)
+        self.x = world_x - pos[0] / self.zoom
+        self.y = world_y - pos[1] / self.zoom
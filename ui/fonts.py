@@ -0,0 +1,56 @@
+import json
+import os
+
+import pygame
+
+# Найденные пути к шрифтам сохраняются между запусками
+CACHE_PATH = os.path.join(os.path.expanduser("~"), ".cache", "graphics_editor", "fonts.json")
+
+_fonts = {}
+
+
+def _read_cache():
+    try:
+        with open(CACHE_PATH, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _write_cache(cache):
+    try:
+        os.makedirs(os.path.dirname(CACHE_PATH), exist_ok=True)
+        with open(CACHE_PATH, "w", encoding="utf-8") as f:
+            json.dump(cache, f, ensure_ascii=False, indent=2)
+    except OSError:
+        pass  # без кэша шрифт просто будет найден заново
+
+
+def font_path(name):
+    """Путь к файлу системного шрифта name (None — встроенный шрифт pygame).
+
+    Системные шрифты перебираются только при первом поиске имени, дальше
+    путь берётся из кэша на диске.
+    """
+    if name is None:
+        return None
+    cache = _read_cache()
+    path = cache.get(name)
+    if name not in cache or (path and not os.path.exists(path)):
+        path = pygame.font.match_font(name)  # полный перебор системных шрифтов
+        cache[name] = path
+        _write_cache(cache)
+    return path
+
+
+def load_font(size, name=None):
+    """Шрифт заданного размера; один объект на (имя, размер) за время работы.
+
+    В отличие от pygame.font.SysFont не сканирует системные шрифты при
+    каждом запуске (SysFont делает это даже для встроенного шрифта).
+    """
+    key = (name, size)
+    font = _fonts.get(key)
+    if font is None:
+        font = _fonts[key] = pygame.font.Font(font_path(name), size)
+    return font
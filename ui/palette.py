@@ -7,21 +7,54 @@ class ColorPalette:
         self.colors = colors
         self.size = 20
         self.rect = pygame.Rect(x, y, len(colors) * (self.size + 5) + 5, self.size + 10)
-        
+
+        # Палитра рисуется один раз в поверхность и обновляется только
+        # при смене выбранного цвета или образца под курсором
+        self.active = None
+        self.hovered = None
+        self.surface = None
+
+    def color_at(self, pos):
+        """Номер образца под точкой pos или None"""
+        if self.rect.collidepoint(pos):
+            index = (pos[0] - self.x) // (self.size + 5)
+            if 0 <= index < len(self.colors):
+                return index
+        return None
+
     def handle_event(self, event):
         if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
-            x, y = event.pos
-            if self.rect.collidepoint(x, y):
-                index = (x - self.x) // (self.size + 5)
-                if 0 <= index < len(self.colors):
-                    return self.colors[index]
+            index = self.color_at(event.pos)
+            if index is not None:
+                return self.colors[index]
         return None
-        
-    def draw(self, surface):
-        pygame.draw.rect(surface, (200, 200, 200), self.rect)
-        pygame.draw.rect(surface, (100, 100, 100), self.rect, 2)
-        
+
+    def update_state(self, active_color, mouse_pos):
+        """Запоминает выбранный цвет и образец под курсором; True, если вид изменился"""
+        hovered = self.color_at(mouse_pos) if mouse_pos else None
+        if active_color == self.active and hovered == self.hovered:
+            return False
+        self.active = active_color
+        self.hovered = hovered
+        self.surface = None
+        return True
+
+    def render(self):
+        surface = pygame.Surface(self.rect.size)
+        surface.fill((200, 200, 200))
+        pygame.draw.rect(surface, (100, 100, 100), surface.get_rect(), 2)
+
         for i, color in enumerate(self.colors):
-            x_pos = self.x + i * (self.size + 5) + 5
-            pygame.draw.rect(surface, color, (x_pos, self.y + 5, self.size, self.size))
-            pygame.draw.rect(surface, (0, 0, 0), (x_pos, self.y + 5, self.size, self.size), 1)
\ No newline at end of file
+            swatch = pygame.Rect(i * (self.size + 5) + 5, 5, self.size, self.size)
+            if color == self.active:
+                pygame.draw.rect(surface, (255, 255, 255), swatch.inflate(4, 4), 2)
+            elif i == self.hovered:
+                pygame.draw.rect(surface, (150, 150, 150), swatch.inflate(4, 4), 2)
+            pygame.draw.rect(surface, color, swatch)
+            pygame.draw.rect(surface, (0, 0, 0), swatch, 1)
+        return surface
+
+    def draw(self, surface):
+        if self.surface is None:
+            self.surface = self.render()
+        surface.blit(self.surface, self.rect)
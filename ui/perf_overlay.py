@@ -0,0 +1,34 @@
+import pygame
+from ui.fonts import load_font
+
+
+class PerfOverlay:
+    """Панель с FPS, гистограммой длительности кадров и размером сцены"""
+
+    def __init__(self, x, y, width=260, height=130):
+        self.rect = pygame.Rect(x, y, width, height)
+        self.font = load_font(20)
+
+    def draw(self, surface, profiler, object_count, vertex_count):
+        pygame.draw.rect(surface, (30, 30, 30), self.rect)
+        pygame.draw.rect(surface, (100, 100, 100), self.rect, 1)
+
+        last = profiler.frame_times[-1] * 1000 if profiler.frame_times else 0.0
+        lines = [
+            f"FPS: {profiler.fps():.1f}   кадр: {last:.1f} мс",
+            f"Объектов: {object_count}   вершин: {vertex_count}",
+        ]
+        for i, line in enumerate(lines):
+            text = self.font.render(line, True, (230, 230, 230))
+            surface.blit(text, (self.rect.x + 8, self.rect.y + 6 + i * 18))
+
+        # Гистограмма: интервалы по 4 мс, последний — 28 мс и дольше
+        counts = profiler.histogram()
+        peak = max(counts) or 1
+        bar_width = (self.rect.width - 16) // len(counts)
+        base = self.rect.bottom - 8
+        for i, count in enumerate(counts):
+            height = int((self.rect.height - 60) * count / peak)
+            color = (90, 200, 90) if i < 4 else (230, 170, 60) if i < 6 else (230, 80, 80)
+            pygame.draw.rect(surface, color,
+                             (self.rect.x + 8 + i * bar_width, base - height, bar_width - 2, height))
@@ -0,0 +1,21 @@
+from collections import OrderedDict
+
+
+class TextCache:
+    """Отрисованные надписи по ключу (текст, цвет); давно не нужные вытесняются"""
+
+    def __init__(self, font, limit=256):
+        self.font = font
+        self.limit = limit
+        self.surfaces = OrderedDict()
+
+    def render(self, text, color):
+        key = (text, tuple(color))
+        surface = self.surfaces.get(key)
+        if surface is None:
+            surface = self.surfaces[key] = self.font.render(text, True, color)
+            if len(self.surfaces) > self.limit:
+                self.surfaces.popitem(last=False)
+        else:
+            self.surfaces.move_to_end(key)
+        return surface
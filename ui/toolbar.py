@@ -1,4 +1,6 @@
 import pygame
+from ui.fonts import load_font
+from ui.text_cache import TextCache
 
 class Toolbar:
     def __init__(self, x, y, tools):
@@ -8,22 +10,54 @@ class Toolbar:
         self.button_size = 50
         self.height = len(tools) * (self.button_size + 5) + 10
         self.rect = pygame.Rect(x, y, 100, self.height)
-        
+
+        # Панель рисуется один раз в поверхность и обновляется только
+        # при смене выбранного инструмента или кнопки под курсором
+        self.text_cache = TextCache(load_font(24))
+        self.active = None
+        self.hovered = None
+        self.surface = None
+
+    def tool_at(self, pos):
+        """Номер кнопки под точкой pos или None"""
+        if self.rect.collidepoint(pos):
+            index = (pos[1] - self.y) // (self.button_size + 5)
+            if 0 <= index < len(self.tools):
+                return index
+        return None
+
     def handle_event(self, event):
         if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
-            x, y = event.pos
-            if self.rect.collidepoint(x, y):
-                index = (y - self.y) // (self.button_size + 5)
-                if 0 <= index < len(self.tools):
-                    return self.tools[index][0]
+            index = self.tool_at(event.pos)
+            if index is not None:
+                return self.tools[index][0]
         return None
-        
+
+    def update_state(self, active_tool, mouse_pos):
+        """Запоминает выбранный инструмент и кнопку под курсором; True, если вид изменился"""
+        hovered = self.tool_at(mouse_pos) if mouse_pos else None
+        if active_tool == self.active and hovered == self.hovered:
+            return False
+        self.active = active_tool
+        self.hovered = hovered
+        self.surface = None
+        return True
+
+    def render(self):
+        surface = pygame.Surface(self.rect.size)
+        surface.fill((200, 200, 200))
+        pygame.draw.rect(surface, (100, 100, 100), surface.get_rect(), 2)
+
+        for i, (tool, name) in enumerate(self.tools):
+            y_pos = i * (self.button_size + 5) + 10
+            if tool == self.active:
+                pygame.draw.rect(surface, (170, 185, 225), (4, y_pos - 4, self.rect.width - 8, 24))
+            elif i == self.hovered:
+                pygame.draw.rect(surface, (215, 215, 215), (4, y_pos - 4, self.rect.width - 8, 24))
+            surface.blit(self.text_cache.render(name, (0, 0, 0)), (10, y_pos))
+        return surface
+
     def draw(self, surface):
-        pygame.draw.rect(surface, (200, 200, 200), self.rect)
-        pygame.draw.rect(surface, (100, 100, 100), self.rect, 2)
-        
-        font = pygame.font.SysFont(None, 24)
-        for i, (_, name) in enumerate(self.tools):
-            y_pos = self.y + i * (self.button_size + 5) + 10
-            text = font.render(name, True, (0, 0, 0))
-            surface.blit(text, (self.x + 10, y_pos))
\ No newline at end of file
+        if self.surface is None:
+            self.surface = self.render()
+        surface.blit(self.surface, self.rect)
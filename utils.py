@@ -0,0 +1,20 @@
+import importlib.util
+import sys
+
+
+def lazy_import(name):
+    """Модуль, который загружается при первом обращении к его атрибуту.
+
+    Модуль верхнего уровня (find_spec для подмодуля импортирует пакет).
+    Первое обращение должно произойти на главном потоке.
+    """
+    module = sys.modules.get(name)
+    if module is not None:
+        return module
+    spec = importlib.util.find_spec(name)
+    loader = importlib.util.LazyLoader(spec.loader)
+    spec.loader = loader
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    loader.exec_module(module)
+    return module